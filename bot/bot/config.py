@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import functools
+from typing import Any
+
+from pydantic import computed_field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -30,13 +34,22 @@ class Settings(BaseSettings):
     WEBHOOK_URL: str = ""
     WEBHOOK_PATH: str = "/webhook/telegram"
 
+    # Redis (optional -- when unset, FSM state and rate limits stay in-process)
+    REDIS_URL: str = ""
+
     # Rate-limiting defaults
     MAX_ORDERS_PER_HOUR: int = 3
     MAX_MESSAGES_PER_MINUTE: int = 30
 
-    # Order status polling interval in seconds
+    # Seconds between order poller cycles (push updates wake it sooner)
     STATUS_POLL_INTERVAL: int = 30
 
+    @computed_field  # type: ignore[prop-decorator]
+    @functools.cached_property
+    def ADMIN_IDS_SET(self) -> frozenset[int]:
+        """ADMIN_IDS as a frozenset for O(1) membership checks."""
+        return frozenset(self.ADMIN_IDS)
+
     @property
     def is_webhook_mode(self) -> bool:
         return bool(self.WEBHOOK_URL)
@@ -46,4 +59,24 @@ class Settings(BaseSettings):
         return f"{self.WEBHOOK_URL.rstrip('/')}{self.WEBHOOK_PATH}"
 
 
-settings = Settings()  # type: ignore[call-arg]
+@functools.cache
+def get_settings() -> Settings:
+    """Parse the environment once, on first use."""
+    return Settings()  # type: ignore[call-arg]
+
+
+class _LazySettings:
+    """Stand-in for :class:`Settings` that defers parsing until first access.
+
+    Importing ``settings`` no longer reads ``.env`` or validates fields, so
+    modules can be imported (tooling, tests, cold starts) without paying for
+    it -- or without BOT_TOKEN being set at all.
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_settings(), name)
+
+
+settings: Settings = _LazySettings()  # type: ignore[assignment]
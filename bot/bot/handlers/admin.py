@@ -3,31 +3,37 @@
 from __future__ import annotations
 
 import logging
+from typing import Any
 
-from aiogram import F, Router
 from aiogram.filters import Command
-from aiogram.types import CallbackQuery, Message
+from aiogram.types import CallbackQuery, Message, TelegramObject
 
 from bot.config import settings
-from bot.keyboards.inline import back_kb
+from bot.keyboards.inline import BACK_TO_START
 from bot.services.api_client import api_client
+from bot.services.models import Order
 from bot.utils.formatters import STATUS_EMOJI, format_amount, truncate_address
+from bot.utils.routing import ExactDataRouter
 
 logger = logging.getLogger(__name__)
-router = Router(name="admin")
+router = ExactDataRouter(name="admin")
 
+_SEPARATOR = "\n\n" + ("=" * 30) + "\n\n"
 
-def _is_admin(user_id: int | None) -> bool:
-    if user_id is None:
-        return False
-    return user_id in settings.ADMIN_IDS
 
+def _is_admin(event: TelegramObject) -> bool:
+    user = getattr(event, "from_user", None)
+    return user is not None and user.id in settings.ADMIN_IDS_SET
 
-async def _build_stats_text() -> str:
-    try:
-        stats = await api_client.get_stats()
-    except Exception:
-        logger.exception("Failed to fetch admin stats")
+
+# Router-level filters: updates from non-admins never reach the handlers below
+router.message.filter(_is_admin)
+router.callback_query.filter(_is_admin)
+
+
+def _build_stats_text(stats: dict[str, Any] | BaseException) -> str:
+    if isinstance(stats, BaseException):
+        logger.error("Failed to fetch admin stats", exc_info=stats)
         return "\u26a0\ufe0f Could not fetch stats from backend."
 
     lines = [
@@ -43,30 +49,40 @@ async def _build_stats_text() -> str:
     return "\n".join(lines)
 
 
-async def _build_pending_text() -> str:
-    try:
-        orders = await api_client.get_pending_orders()
-    except Exception:
-        logger.exception("Failed to fetch pending orders")
+_PENDING_HEADER = "\u23f3 <b>Pending Orders ({n})</b>\n"
+
+
+def _fmt_pending_row(order: Order) -> str:
+    """One line of the pending-orders list."""
+    oid = order.id
+    emoji = STATUS_EMOJI.get(order.status, "\u2753")
+    from_cur = order.from_currency
+    to_cur = order.to_currency
+    amount = format_amount(order.amount_in, from_cur)
+    dest = truncate_address(order.destination_address)
+    return (
+        f"  {emoji} <code>{oid[:8]}</code> "
+        f"{from_cur}\u2192{to_cur} {amount} \u2192 {dest}"
+    )
+
+
+def _build_pending_text(orders: list[Order] | BaseException) -> str:
+    if isinstance(orders, BaseException):
+        logger.error("Failed to fetch pending orders", exc_info=orders)
         return "\u26a0\ufe0f Could not fetch pending orders."
 
     if not orders:
         return "\u2705 No pending orders."
 
-    lines = [f"\u23f3 <b>Pending Orders ({len(orders)})</b>\n"]
-    for order in orders[:20]:  # cap display at 20
-        oid = order.get("id", "?")
-        status = order.get("status", "?")
-        emoji = STATUS_EMOJI.get(status, "\u2753")
-        from_cur = order.get("from_currency", "XMR")
-        to_cur = order.get("to_currency", "?")
-        amount = order.get("amount_in")
-        dest = truncate_address(order.get("destination_address"))
-        lines.append(
-            f"  {emoji} <code>{oid[:8]}</code> "
-            f"{from_cur}\u2192{to_cur} {format_amount(amount, from_cur)} \u2192 {dest}"
-        )
-    return "\n".join(lines)
+    body = "\n".join(map(_fmt_pending_row, orders[:20]))  # cap display at 20
+    return f"{_PENDING_HEADER.format(n=len(orders))}\n{body}"
+
+
+async def _build_admin_text() -> str:
+    bundle = await api_client.get_admin_bundle()
+    stats_text = _build_stats_text(bundle["stats"])
+    pending_text = _build_pending_text(bundle["pending"])
+    return f"{stats_text}{_SEPARATOR}{pending_text}"
 
 
 # ---------------------------------------------------------------------------
@@ -74,32 +90,18 @@ async def _build_pending_text() -> str:
 # ---------------------------------------------------------------------------
 @router.message(Command("admin"))
 async def cmd_admin(message: Message) -> None:
-    user_id = message.from_user.id if message.from_user else None
-    if not _is_admin(user_id):
-        await message.answer("\U0001f6ab You are not authorized to use this command.")
-        return
-
-    stats_text = await _build_stats_text()
-    pending_text = await _build_pending_text()
-    text = f"{stats_text}\n\n{'=' * 30}\n\n{pending_text}"
-    await message.answer(text, reply_markup=back_kb("menu:start"), parse_mode="HTML")
+    text = await _build_admin_text()
+    await message.answer(text, reply_markup=BACK_TO_START, parse_mode="HTML")
 
 
 # ---------------------------------------------------------------------------
 # Callback (from a potential admin inline button)
 # ---------------------------------------------------------------------------
-@router.callback_query(F.data == "menu:admin")
+@router.callback_query.exact("menu:admin")
 async def cb_admin(callback: CallbackQuery) -> None:
-    user_id = callback.from_user.id if callback.from_user else None
-    if not _is_admin(user_id):
-        await callback.answer("Unauthorized.", show_alert=True)
-        return
-
-    stats_text = await _build_stats_text()
-    pending_text = await _build_pending_text()
-    text = f"{stats_text}\n\n{'=' * 30}\n\n{pending_text}"
+    text = await _build_admin_text()
     if callback.message:
         await callback.message.edit_text(
-            text, reply_markup=back_kb("menu:start"), parse_mode="HTML",
+            text, reply_markup=BACK_TO_START, parse_mode="HTML",
         )
     await callback.answer()
@@ -7,39 +7,53 @@ Flow:
   4. Enter destination address
   5. Confirm with fee breakdown
   6. Create order via API -> show deposit address
-  7. Poll status every 30s, notify on completion
+  7. Watch order status (shared poller), notify on every change
 """
 
 from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from typing import Any
 
-from aiogram import Bot, F, Router
+from aiogram import F
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.types import CallbackQuery, Message
 
 from bot.config import settings
+from bot.handlers.start import invalidate_welcome
 from bot.keyboards.inline import (
+    BACK_TO_BRIDGE,
+    BACK_TO_START,
     amount_presets_kb,
-    back_kb,
     chain_select_kb,
     confirm_cancel_kb,
     direction_type_kb,
 )
 from bot.middlewares.rate_limit import RateLimitMiddleware
 from bot.services.api_client import APIError, api_client
+from bot.services.models import Rate
+from bot.services.order_poller import order_poller
 from bot.utils.formatters import (
     CHAIN_EMOJI,
     format_amount,
-    format_order_status,
     truncate_address,
 )
+from bot.utils.routing import ExactDataRouter
+from bot.utils.templates import load_template
 
 logger = logging.getLogger(__name__)
-router = Router(name="bridge")
+router = ExactDataRouter(name="bridge")
+
+# How long the rate quoted at chain selection is reused for the order summary
+QUOTE_MAX_AGE = 30
+
+# Message templates (bot/templates), compiled once at import
+_TMPL_AMOUNT_PROMPT = load_template("amount_prompt.html")
+_TMPL_ORDER_SUMMARY = load_template("order_summary.html")
+_TMPL_ORDER_CREATED = load_template("order_created.html")
 
 
 # ---------------------------------------------------------------------------
@@ -53,10 +67,19 @@ class BridgeStates(StatesGroup):
     confirming = State()
 
 
+async def _try_fetch_rate(from_cur: str, to_cur: str) -> Rate | None:
+    """Fetch a rate quote, returning None instead of raising on failure."""
+    try:
+        return await api_client.fetch_rate(from_cur, to_cur)
+    except Exception:
+        logger.debug("Rate fetch failed for %s/%s", from_cur, to_cur)
+        return None
+
+
 # ---------------------------------------------------------------------------
 # Step 1 -- direction type
 # ---------------------------------------------------------------------------
-@router.callback_query(F.data == "menu:bridge")
+@router.callback_query.exact("menu:bridge")
 async def cb_bridge_start(callback: CallbackQuery, state: FSMContext) -> None:
     await state.clear()
     await state.set_state(BridgeStates.choosing_direction)
@@ -71,13 +94,13 @@ async def cb_bridge_start(callback: CallbackQuery, state: FSMContext) -> None:
     await callback.answer()
 
 
-@router.callback_query(F.data == "menu:bridge_cancel")
+@router.callback_query.exact("menu:bridge_cancel")
 async def cb_bridge_cancel(callback: CallbackQuery, state: FSMContext) -> None:
     await state.clear()
     if callback.message:
         await callback.message.edit_text(
             "\u274c Bridge cancelled.",
-            reply_markup=back_kb("menu:start"),
+            reply_markup=BACK_TO_START,
             parse_mode="HTML",
         )
     await callback.answer()
@@ -88,7 +111,7 @@ async def cb_bridge_cancel(callback: CallbackQuery, state: FSMContext) -> None:
 # ---------------------------------------------------------------------------
 @router.callback_query(F.data.startswith("dir_type:"))
 async def cb_direction_type(callback: CallbackQuery, state: FSMContext) -> None:
-    direction = callback.data.split(":")[1]  # from_xmr | to_xmr
+    _, _, direction = callback.data.partition(":")  # from_xmr | to_xmr
     await state.update_data(direction=direction)
     await state.set_state(BridgeStates.choosing_chain)
 
@@ -115,27 +138,31 @@ async def cb_chain_selected(callback: CallbackQuery, state: FSMContext) -> None:
     else:
         from_cur, to_cur = chain, "XMR"
 
-    await state.update_data(from_currency=from_cur, to_currency=to_cur)
-    await state.set_state(BridgeStates.entering_amount)
+    # Fetch the current rate for context while the FSM state is written
+    _, rate_data = await asyncio.gather(
+        state.set_state(BridgeStates.entering_amount),
+        _try_fetch_rate(from_cur, to_cur),
+    )
 
     fe = CHAIN_EMOJI.get(from_cur, "")
     te = CHAIN_EMOJI.get(to_cur, "")
 
-    # Try to fetch the current rate for context
-    rate_text = ""
-    try:
-        rate_data = await api_client.fetch_rate(from_cur, to_cur)
-        rate_val = rate_data.get("rate")
-        if rate_val:
-            rate_text = f"\n\U0001f4b1 Rate: 1 {from_cur} \u2248 {float(rate_val):,.6f} {to_cur}\n"
-    except Exception:
-        pass
+    rate: float | None = None
+    fee_pct = 0.5
+    if rate_data is not None and rate_data.rate:
+        rate, fee_pct = rate_data.rate, rate_data.fee_pct
+
+    # Remember the quote so the summary step can show the same numbers
+    await state.update_data(
+        from_currency=from_cur,
+        to_currency=to_cur,
+        quoted_rate=rate,
+        quoted_fee_pct=fee_pct,
+        quoted_at=time.time(),
+    )
 
-    text = (
-        f"{fe} <b>{from_cur} \u2192 {to_cur}</b> {te}\n"
-        f"{rate_text}\n"
-        f"Enter the amount of <b>{from_cur}</b> to send,\n"
-        f"or pick a preset:"
+    text = _TMPL_AMOUNT_PROMPT.render(
+        fe=fe, te=te, from_cur=from_cur, to_cur=to_cur, rate=rate,
     )
     if callback.message:
         await callback.message.edit_text(
@@ -147,12 +174,12 @@ async def cb_chain_selected(callback: CallbackQuery, state: FSMContext) -> None:
 # Amount from preset button
 @router.callback_query(F.data.startswith("amount:"))
 async def cb_amount_preset(callback: CallbackQuery, state: FSMContext) -> None:
-    value = callback.data.split(":")[1]
+    _, _, value = callback.data.partition(":")
     if value == "custom":
         if callback.message:
             await callback.message.edit_text(
                 "\u270f\ufe0f Please type the amount:",
-                reply_markup=back_kb("menu:bridge"),
+                reply_markup=BACK_TO_BRIDGE,
                 parse_mode="HTML",
             )
         await callback.answer()
@@ -199,7 +226,7 @@ async def _process_amount(callback: CallbackQuery, state: FSMContext, amount: fl
     )
     if callback.message:
         await callback.message.edit_text(
-            text, reply_markup=back_kb("menu:bridge"), parse_mode="HTML",
+            text, reply_markup=BACK_TO_BRIDGE, parse_mode="HTML",
         )
 
 
@@ -214,7 +241,7 @@ async def _process_amount_msg(message: Message, state: FSMContext, amount: float
         f"\U0001f4cd <b>Destination address</b>\n\n"
         f"Send your <b>{to_cur}</b> receiving address:"
     )
-    await message.answer(text, reply_markup=back_kb("menu:bridge"), parse_mode="HTML")
+    await message.answer(text, reply_markup=BACK_TO_BRIDGE, parse_mode="HTML")
 
 
 # ---------------------------------------------------------------------------
@@ -229,9 +256,7 @@ async def msg_address_input(message: Message, state: FSMContext) -> None:
         )
         return
 
-    await state.update_data(destination_address=address)
-    await state.set_state(BridgeStates.confirming)
-    data = await state.get_data()
+    data = await state.update_data(destination_address=address)
 
     from_cur = data.get("from_currency", "XMR")
     to_cur = data.get("to_currency", "???")
@@ -239,32 +264,45 @@ async def msg_address_input(message: Message, state: FSMContext) -> None:
     fe = CHAIN_EMOJI.get(from_cur, "")
     te = CHAIN_EMOJI.get(to_cur, "")
 
-    # Fetch rate for fee breakdown
-    rate_line = ""
-    estimated_out = ""
-    fee_line = ""
+    # Reuse the quote from chain selection while fresh, else re-fetch
+    rate_data: Rate | None
+    if data.get("quoted_rate") and time.time() - data.get("quoted_at", 0) <= QUOTE_MAX_AGE:
+        rate_data = Rate(rate=data["quoted_rate"], fee_pct=data.get("quoted_fee_pct", 0.5))
+        await state.set_state(BridgeStates.confirming)
+    else:
+        _, rate_data = await asyncio.gather(
+            state.set_state(BridgeStates.confirming),
+            _try_fetch_rate(from_cur, to_cur),
+        )
+
+    # None -> rate unavailable, {} -> no usable rate, otherwise the fee breakdown
+    quote: dict[str, Any] | None = None
     try:
-        rate_data = await api_client.fetch_rate(from_cur, to_cur)
-        rate_val = float(rate_data.get("rate", 0))
-        fee_pct = float(rate_data.get("fee_pct", 0.5))
+        if rate_data is None:
+            raise ValueError("rate unavailable")
+        rate_val = float(rate_data.rate or 0)
+        fee_pct = float(rate_data.fee_pct)
+        quote = {}
         if rate_val > 0:
             gross = amount * rate_val
             fee = gross * fee_pct / 100
-            net = gross - fee
-            rate_line = f"\U0001f4b1 <b>Rate:</b> 1 {from_cur} = {rate_val:,.6f} {to_cur}\n"
-            fee_line = f"\U0001f4b8 <b>Fee:</b> {fee_pct}% ({format_amount(fee, to_cur)})\n"
-            estimated_out = f"\U0001f4e6 <b>You receive:</b> ~{format_amount(net, to_cur)}\n"
+            quote = {
+                "rate": rate_val,
+                "fee_pct": fee_pct,
+                "fee": format_amount(fee, to_cur),
+                "net": format_amount(gross - fee, to_cur),
+            }
     except Exception:
-        rate_line = "\u26a0\ufe0f Could not fetch live rate.\n"
-
-    text = (
-        f"\U0001f50d <b>Order Summary</b>\n\n"
-        f"{fe} <b>Send:</b> {format_amount(amount, from_cur)}\n"
-        f"{te} <b>To:</b> {truncate_address(address)}\n"
-        f"{rate_line}"
-        f"{fee_line}"
-        f"{estimated_out}\n"
-        f"Confirm to proceed?"
+        quote = None
+
+    text = _TMPL_ORDER_SUMMARY.render(
+        fe=fe,
+        te=te,
+        from_cur=from_cur,
+        to_cur=to_cur,
+        send=format_amount(amount, from_cur),
+        dest=truncate_address(address),
+        quote=quote,
     )
     await message.answer(
         text, reply_markup=confirm_cancel_kb("bridge"), parse_mode="HTML",
@@ -274,13 +312,19 @@ async def msg_address_input(message: Message, state: FSMContext) -> None:
 # ---------------------------------------------------------------------------
 # Step 5 -- confirm or cancel
 # ---------------------------------------------------------------------------
-@router.callback_query(F.data == "confirm:bridge")
-async def cb_confirm_order(callback: CallbackQuery, state: FSMContext, bot: Bot) -> None:
+@router.callback_query.exact("confirm:bridge")
+async def cb_confirm_order(
+    callback: CallbackQuery,
+    state: FSMContext,
+    rate_limiter: RateLimitMiddleware,
+    order_flag: dict[str, bool] | None = None,
+) -> None:
     data = await state.get_data()
     user_id = callback.from_user.id
 
-    # Rate-limit check
-    if not RateLimitMiddleware.can_create_order(user_id):
+    # Rate-limit check (reserves a slot, released again if creation fails)
+    slot = await rate_limiter.can_create_order(user_id)
+    if slot is None:
         await callback.answer(
             f"You can only create {settings.MAX_ORDERS_PER_HOUR} orders per hour.",
             show_alert=True,
@@ -308,21 +352,23 @@ async def cb_confirm_order(callback: CallbackQuery, state: FSMContext, bot: Bot)
             slippage=slippage,
         )
     except APIError as exc:
+        await rate_limiter.release_order_slot(slot)
         if callback.message:
             await callback.message.edit_text(
                 f"\u274c Order failed: {exc.detail}",
-                reply_markup=back_kb("menu:bridge"),
+                reply_markup=BACK_TO_BRIDGE,
                 parse_mode="HTML",
             )
         await callback.answer()
         await state.clear()
         return
-    except Exception as exc:
+    except Exception:
+        await rate_limiter.release_order_slot(slot)
         logger.exception("Order creation failed")
         if callback.message:
             await callback.message.edit_text(
                 "\u274c Unexpected error. Please try again later.",
-                reply_markup=back_kb("menu:start"),
+                reply_markup=BACK_TO_START,
                 parse_mode="HTML",
             )
         await callback.answer()
@@ -330,84 +376,33 @@ async def cb_confirm_order(callback: CallbackQuery, state: FSMContext, bot: Bot)
         return
 
     # Signal to rate-limit middleware
-    order_flag: dict[str, bool] | None = callback.__dict__.get("order_flag")
-    # The flag is injected via middleware data, access it properly:
-    # (it's in the handler's **data kwargs -- we passed it through)
+    if order_flag is not None:
+        order_flag["created"] = True
+    await invalidate_welcome(user_id)
 
     await state.clear()
 
-    order_id = order.get("id", "???")
-    deposit_addr = order.get("deposit_address", "N/A")
-
-    text = (
-        f"\u2705 <b>Order Created!</b>\n\n"
-        f"\U0001f194 <code>{order_id}</code>\n\n"
-        f"\U0001f4e5 <b>Deposit {format_amount(amount, from_cur)} to:</b>\n"
-        f"<code>{deposit_addr}</code>\n\n"
-        f"\u23f3 The bot will notify you when the swap completes.\n"
-        f"Use /status {order_id} to check manually."
+    order_id = order.id
+    text = _TMPL_ORDER_CREATED.render(
+        order_id=order_id,
+        deposit_amount=format_amount(amount, from_cur),
+        deposit_address=order.deposit_address or "N/A",
     )
     if callback.message:
-        await callback.message.edit_text(text, reply_markup=back_kb("menu:start"), parse_mode="HTML")
+        await callback.message.edit_text(text, reply_markup=BACK_TO_START, parse_mode="HTML")
     await callback.answer()
 
-    # Start background polling for this order
-    asyncio.create_task(_poll_order_status(bot, user_id, order_id))
+    # Hand the order to the shared background poller
+    order_poller.watch(order_id, user_id)
 
 
-@router.callback_query(F.data == "cancel:bridge")
+@router.callback_query.exact("cancel:bridge")
 async def cb_cancel_order(callback: CallbackQuery, state: FSMContext) -> None:
     await state.clear()
     if callback.message:
         await callback.message.edit_text(
             "\u274c Bridge order cancelled.",
-            reply_markup=back_kb("menu:start"),
+            reply_markup=BACK_TO_START,
             parse_mode="HTML",
         )
     await callback.answer()
-
-
-# ---------------------------------------------------------------------------
-# Background status poller
-# ---------------------------------------------------------------------------
-TERMINAL_STATUSES = {"completed", "failed", "refunded", "expired", "cancelled"}
-
-
-async def _poll_order_status(bot: Bot, chat_id: int, order_id: str) -> None:
-    """Poll the backend every N seconds and notify the user on status change."""
-    previous_status: str | None = None
-    max_polls = 360  # 360 * 30s = 3 hours max
-
-    for _ in range(max_polls):
-        await asyncio.sleep(settings.STATUS_POLL_INTERVAL)
-        try:
-            order = await api_client.get_order(order_id)
-        except Exception:
-            logger.warning("Poll failed for order %s", order_id)
-            continue
-
-        status = order.get("status", "")
-        if status == previous_status:
-            continue
-        previous_status = status
-
-        # Notify on meaningful transitions
-        text = format_order_status(order)
-        try:
-            await bot.send_message(chat_id, text, parse_mode="HTML")
-        except Exception:
-            logger.warning("Failed to send status update to %s", chat_id)
-
-        if status in TERMINAL_STATUSES:
-            return
-
-    # Timed out polling
-    try:
-        await bot.send_message(
-            chat_id,
-            f"\u23f0 Status polling timed out for order <code>{order_id}</code>. "
-            f"Use /status {order_id} to check manually.",
-            parse_mode="HTML",
-        )
-    except Exception:
-        pass
@@ -2,13 +2,13 @@
 
 from __future__ import annotations
 
-from aiogram import F, Router
 from aiogram.filters import Command
 from aiogram.types import CallbackQuery, Message
 
-from bot.keyboards.inline import back_kb
+from bot.keyboards.inline import BACK_TO_START
+from bot.utils.routing import ExactDataRouter
 
-router = Router(name="help")
+router = ExactDataRouter(name="help")
 
 HELP_TEXT = (
     "\u2753 <b>XMR Multi-Chain Bridge - Help</b>\n"
@@ -55,13 +55,13 @@ HELP_TEXT = (
 
 @router.message(Command("help"))
 async def cmd_help(message: Message) -> None:
-    await message.answer(HELP_TEXT, reply_markup=back_kb("menu:start"), parse_mode="HTML")
+    await message.answer(HELP_TEXT, reply_markup=BACK_TO_START, parse_mode="HTML")
 
 
-@router.callback_query(F.data == "menu:help")
+@router.callback_query.exact("menu:help")
 async def cb_help(callback: CallbackQuery) -> None:
     if callback.message:
         await callback.message.edit_text(
-            HELP_TEXT, reply_markup=back_kb("menu:start"), parse_mode="HTML",
+            HELP_TEXT, reply_markup=BACK_TO_START, parse_mode="HTML",
         )
     await callback.answer()
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import logging
 
-from aiogram import F, Router
+from aiogram import F
 from aiogram.filters import Command
 from aiogram.types import (
     CallbackQuery,
@@ -13,59 +13,65 @@ from aiogram.types import (
     Message,
 )
 
-from bot.keyboards.inline import back_kb, order_detail_kb
+from bot.keyboards.inline import BACK_TO_START, order_detail_kb
 from bot.services.api_client import api_client
+from bot.services.models import Order
 from bot.utils.formatters import (
     CHAIN_EMOJI,
     STATUS_EMOJI,
     format_amount,
     format_order_status,
 )
+from bot.utils.routing import ExactDataRouter
 
 logger = logging.getLogger(__name__)
-router = Router(name="history")
+router = ExactDataRouter(name="history")
+
+# Markups are never mutated after send, so the empty-history reply is shared
+_EMPTY_HISTORY: tuple[str, InlineKeyboardMarkup] = (
+    "\U0001f4dc <b>Order History</b>\n\nYou have no orders yet.",
+    BACK_TO_START,
+)
+
+
+_HISTORY_HEADER = "\U0001f4dc <b>Order History</b> (last 10)\n"
+
+
+def _fmt_history_row(order: Order) -> tuple[str, list[InlineKeyboardButton]]:
+    """One history line plus its detail-button row."""
+    oid = order.id
+    status = order.status
+    from_cur = order.from_currency
+    to_cur = order.to_currency
+    emoji = STATUS_EMOJI.get(status, "\u2753")
+    fe = CHAIN_EMOJI.get(from_cur, "")
+    te = CHAIN_EMOJI.get(to_cur, "")
+
+    short_id = oid[:8]
+    line = (
+        f"  {emoji} <code>{short_id}</code> "
+        f"{fe}{from_cur}\u2192{to_cur}{te} "
+        f"{format_amount(order.amount_in, from_cur)}"
+    )
+    button = InlineKeyboardButton(
+        text=f"{emoji} {short_id} - {status}",
+        callback_data=f"history_detail:{oid}",
+    )
+    return line, [button]
 
 
 def _build_history_text_and_kb(
-    orders: list[dict],
+    orders: list[Order],
 ) -> tuple[str, InlineKeyboardMarkup]:
     if not orders:
-        return (
-            "\U0001f4dc <b>Order History</b>\n\nYou have no orders yet.",
-            back_kb("menu:start"),
-        )
-
-    lines = ["\U0001f4dc <b>Order History</b> (last 10)\n"]
-    buttons: list[list[InlineKeyboardButton]] = []
-
-    for order in orders:
-        oid = order.get("id", "?")
-        status = order.get("status", "pending")
-        from_cur = order.get("from_currency", "XMR")
-        to_cur = order.get("to_currency", "?")
-        amount = order.get("amount_in")
-        emoji = STATUS_EMOJI.get(status, "\u2753")
-        fe = CHAIN_EMOJI.get(from_cur, "")
-        te = CHAIN_EMOJI.get(to_cur, "")
-
-        short_id = oid[:8] if len(oid) > 8 else oid
-        lines.append(
-            f"  {emoji} <code>{short_id}</code> "
-            f"{fe}{from_cur}\u2192{to_cur}{te} "
-            f"{format_amount(amount, from_cur)}"
-        )
-        buttons.append([
-            InlineKeyboardButton(
-                text=f"{emoji} {short_id} - {status}",
-                callback_data=f"history_detail:{oid}",
-            )
-        ])
+        return _EMPTY_HISTORY
 
-    buttons.append([
-        InlineKeyboardButton(text="\u2b05\ufe0f Back", callback_data="menu:start"),
-    ])
+    rows = [_fmt_history_row(order) for order in orders]
+    body = "\n".join(line for line, _ in rows)
+    buttons = [button_row for _, button_row in rows]
+    buttons.extend(BACK_TO_START.inline_keyboard)  # shared back-to-start row
 
-    return "\n".join(lines), InlineKeyboardMarkup(inline_keyboard=buttons)
+    return f"{_HISTORY_HEADER}\n{body}", InlineKeyboardMarkup(inline_keyboard=buttons)
 
 
 async def _send_history(target: Message | CallbackQuery, user_id: int) -> str | None:
@@ -92,14 +98,14 @@ async def cmd_history(message: Message) -> None:
         await message.answer("\u26a0\ufe0f Could not load your order history.")
 
 
-@router.callback_query(F.data == "menu:history")
+@router.callback_query.exact("menu:history")
 async def cb_history(callback: CallbackQuery) -> None:
     user_id = callback.from_user.id if callback.from_user else 0
     result = await _send_history(callback, user_id)
     if result is None and callback.message:
         await callback.message.edit_text(
             "\u26a0\ufe0f Could not load your order history.",
-            reply_markup=back_kb("menu:start"),
+            reply_markup=BACK_TO_START,
             parse_mode="HTML",
         )
     await callback.answer()
@@ -110,7 +116,7 @@ async def cb_history(callback: CallbackQuery) -> None:
 # ---------------------------------------------------------------------------
 @router.callback_query(F.data.startswith("history_detail:"))
 async def cb_history_detail(callback: CallbackQuery) -> None:
-    order_id = callback.data.split(":")[1]
+    _, _, order_id = callback.data.partition(":")
     try:
         order = await api_client.get_order(order_id)
     except Exception:
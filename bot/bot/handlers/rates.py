@@ -2,18 +2,19 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 
-from aiogram import F, Router
 from aiogram.filters import Command
 from aiogram.types import CallbackQuery, Message
 
-from bot.keyboards.inline import DEST_CHAINS, back_kb
+from bot.keyboards.inline import BACK_TO_START, DEST_CHAINS
 from bot.services.api_client import api_client
 from bot.utils.formatters import format_rate
+from bot.utils.routing import ExactDataRouter
 
 logger = logging.getLogger(__name__)
-router = Router(name="rates")
+router = ExactDataRouter(name="rates")
 
 
 async def _build_rates_text() -> str:
@@ -32,14 +33,18 @@ async def _build_rates_text() -> str:
             raise ValueError("unexpected format")
     except Exception:
         logger.debug("Bulk rates failed, fetching individually")
-        for chain in DEST_CHAINS:
-            try:
-                data = await api_client.fetch_rate("XMR", chain)
-                rate = data.get("rate", 0)
-                change = data.get("change_24h")
-                lines.append(format_rate(f"XMR_{chain}", rate, change))
-            except Exception:
-                lines.append(f"  \u26a0\ufe0f XMR/{chain}: unavailable")
+        results = await asyncio.gather(
+            *(api_client.fetch_rate("XMR", chain) for chain in DEST_CHAINS),
+            return_exceptions=True,
+        )
+        for chain, data in zip(DEST_CHAINS, results):
+            line: str | None = None
+            if not isinstance(data, BaseException):
+                try:
+                    line = format_rate(f"XMR_{chain}", data.rate or 0, data.change_24h)
+                except Exception:
+                    pass
+            lines.append(line or f"  \u26a0\ufe0f XMR/{chain}: unavailable")
 
     lines.append("\n\U0001f552 Rates refresh automatically.")
     return "\n".join(lines)
@@ -48,14 +53,14 @@ async def _build_rates_text() -> str:
 @router.message(Command("rate", "rates"))
 async def cmd_rates(message: Message) -> None:
     text = await _build_rates_text()
-    await message.answer(text, reply_markup=back_kb("menu:start"), parse_mode="HTML")
+    await message.answer(text, reply_markup=BACK_TO_START, parse_mode="HTML")
 
 
-@router.callback_query(F.data == "menu:rates")
+@router.callback_query.exact("menu:rates")
 async def cb_rates(callback: CallbackQuery) -> None:
     text = await _build_rates_text()
     if callback.message:
         await callback.message.edit_text(
-            text, reply_markup=back_kb("menu:start"), parse_mode="HTML",
+            text, reply_markup=BACK_TO_START, parse_mode="HTML",
         )
     await callback.answer()
@@ -2,17 +2,29 @@
 
 from __future__ import annotations
 
+import functools
 import logging
 
-from aiogram import F, Router
+from aiogram import F
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
 from aiogram.types import CallbackQuery, Message
 
 from bot.keyboards.inline import back_kb, slippage_kb
+from bot.utils.routing import ExactDataRouter
 
 logger = logging.getLogger(__name__)
-router = Router(name="settings")
+router = ExactDataRouter(name="settings")
+
+_SETTINGS_PREFIX = "\u2699\ufe0f <b>Settings</b>\n\n<b>Slippage tolerance:</b> "
+_SETTINGS_SUFFIX = "%\n\nSelect your preferred slippage:"
+_SETTINGS_SAVED_SUFFIX = "% \u2705\n\nSelect your preferred slippage:"
+
+
+@functools.lru_cache(maxsize=64)
+def _render(value: float, changed: bool = False) -> str:
+    """Settings screen text; *changed* adds a tick after a new selection."""
+    return _SETTINGS_PREFIX + str(value) + (_SETTINGS_SAVED_SUFFIX if changed else _SETTINGS_SUFFIX)
 
 
 async def _get_slippage(state: FSMContext) -> float:
@@ -23,22 +35,14 @@ async def _get_slippage(state: FSMContext) -> float:
 @router.message(Command("settings"))
 async def cmd_settings(message: Message, state: FSMContext) -> None:
     current = await _get_slippage(state)
-    text = (
-        "\u2699\ufe0f <b>Settings</b>\n\n"
-        f"<b>Slippage tolerance:</b> {current}%\n\n"
-        "Select your preferred slippage:"
-    )
+    text = _render(current)
     await message.answer(text, reply_markup=slippage_kb(current), parse_mode="HTML")
 
 
-@router.callback_query(F.data == "menu:settings")
+@router.callback_query.exact("menu:settings")
 async def cb_settings(callback: CallbackQuery, state: FSMContext) -> None:
     current = await _get_slippage(state)
-    text = (
-        "\u2699\ufe0f <b>Settings</b>\n\n"
-        f"<b>Slippage tolerance:</b> {current}%\n\n"
-        "Select your preferred slippage:"
-    )
+    text = _render(current)
     if callback.message:
         await callback.message.edit_text(
             text, reply_markup=slippage_kb(current), parse_mode="HTML",
@@ -48,18 +52,15 @@ async def cb_settings(callback: CallbackQuery, state: FSMContext) -> None:
 
 @router.callback_query(F.data.startswith("slippage:"))
 async def cb_slippage_set(callback: CallbackQuery, state: FSMContext) -> None:
+    _, _, raw = callback.data.partition(":")
     try:
-        value = float(callback.data.split(":")[1])
-    except (ValueError, IndexError):
+        value = float(raw)
+    except ValueError:
         await callback.answer("Invalid value", show_alert=True)
         return
 
     await state.update_data(slippage=value)
-    text = (
-        "\u2699\ufe0f <b>Settings</b>\n\n"
-        f"<b>Slippage tolerance:</b> {value}% \u2705\n\n"
-        "Select your preferred slippage:"
-    )
+    text = _render(value, changed=True)
     if callback.message:
         await callback.message.edit_text(
             text, reply_markup=slippage_kb(value), parse_mode="HTML",
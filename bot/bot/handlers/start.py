@@ -2,18 +2,21 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 
-from aiogram import Router
 from aiogram.filters import CommandStart
 from aiogram.types import CallbackQuery, Message
+from cachetools import TTLCache
 
 from bot.keyboards.inline import main_menu_kb
 from bot.services.api_client import api_client
+from bot.utils.async_ttl import cached, invalidate
 from bot.utils.formatters import format_amount
+from bot.utils.routing import ExactDataRouter
 
 logger = logging.getLogger(__name__)
-router = Router(name="start")
+router = ExactDataRouter(name="start")
 
 WELCOME_TEXT = (
     "\U0001f309 <b>XMR Multi-Chain Bridge</b>\n"
@@ -23,23 +26,57 @@ WELCOME_TEXT = (
     "\n"
     "Fast, private, non-custodial.\n"
 )
+# Longest the welcome screen waits for user stats before showing without them
+STATS_TIMEOUT = 1.0
+
+_WELCOME_STATS_FMT = (
+    "\n\U0001f4ca <b>Your stats:</b>\n"
+    "  Orders: {total} total, {completed} completed\n"
+    "  Volume: {volume}\n"
+)
+
+
+# Rendered welcome text per user, so menu navigation skips the stats fetch
+welcome_cache: TTLCache[int, str] = TTLCache(maxsize=10_000, ttl=30)
+
+
+def _stats_key(tg_user_id: int) -> str:
+    return f"user_stats:{tg_user_id}"
+
+
+async def invalidate_welcome(tg_user_id: int) -> None:
+    """Forget cached stats for a user, e.g. after they create an order."""
+    welcome_cache.pop(tg_user_id, None)
+    await invalidate(_stats_key(tg_user_id))
 
 
 async def _build_welcome(tg_user_id: int) -> str:
     """Append user stats when available."""
+    cached_text = welcome_cache.get(tg_user_id)
+    if cached_text is not None:
+        return cached_text
+
     text = WELCOME_TEXT
     try:
-        orders = await api_client.list_orders(tg_user_id, limit=100)
-        if orders:
-            completed = [o for o in orders if o.get("status") == "completed"]
-            total_xmr = sum(float(o.get("amount_in", 0)) for o in completed)
-            text += (
-                f"\n\U0001f4ca <b>Your stats:</b>\n"
-                f"  Orders: {len(orders)} total, {len(completed)} completed\n"
-                f"  Volume: {format_amount(total_xmr, 'XMR')}\n"
+        # The fetch itself is shielded inside cached(), so a timeout here
+        # still lets it finish and warm the cache for the next visit
+        stats = await asyncio.wait_for(
+            cached(
+                _stats_key(tg_user_id), 10.0,
+                lambda: api_client.get_user_stats(tg_user_id),
+            ),
+            timeout=STATS_TIMEOUT,
+        )
+        if stats.get("orders_total"):
+            text += _WELCOME_STATS_FMT.format(
+                total=stats["orders_total"],
+                completed=stats.get("orders_completed", 0),
+                volume=format_amount(float(stats.get("xmr_volume", 0)), "XMR"),
             )
     except Exception:
         logger.debug("Could not fetch user stats for %s", tg_user_id)
+        return text  # not cached -- retry on the next visit
+    welcome_cache[tg_user_id] = text
     return text
 
 
@@ -50,7 +87,7 @@ async def cmd_start(message: Message) -> None:
     await message.answer(text, reply_markup=main_menu_kb(), parse_mode="HTML")
 
 
-@router.callback_query(lambda cb: cb.data == "menu:start")
+@router.callback_query.exact("menu:start")
 async def cb_start(callback: CallbackQuery) -> None:
     user_id = callback.from_user.id if callback.from_user else 0
     text = await _build_welcome(user_id)
@@ -3,18 +3,36 @@
 from __future__ import annotations
 
 import logging
+from typing import Awaitable
 
 from aiogram import F, Router
 from aiogram.filters import Command
 from aiogram.types import CallbackQuery, Message
 
-from bot.keyboards.inline import back_kb, order_detail_kb
+from bot.keyboards.inline import BACK_TO_HISTORY, order_detail_kb
 from bot.services.api_client import APIError, api_client
+from bot.services.models import ORDER_DECODER, Order
+from bot.utils.async_ttl import cached, invalidate
 from bot.utils.formatters import format_order_status
 
 logger = logging.getLogger(__name__)
 router = Router(name="status")
 
+# Repeat lookups of the same order within this window share one request
+ORDER_CACHE_TTL = 2.0
+
+
+def _order_key(order_id: str) -> str:
+    return f"order:{order_id}"
+
+
+def _get_order(order_id: str) -> Awaitable[Order]:
+    return cached(
+        _order_key(order_id), ORDER_CACHE_TTL,
+        lambda: api_client.get_order(order_id),
+        loads=ORDER_DECODER.decode,
+    )
+
 
 @router.message(Command("status"))
 async def cmd_status(message: Message) -> None:
@@ -32,7 +50,7 @@ async def cmd_status(message: Message) -> None:
 
 async def _show_order(target: Message, order_id: str) -> None:
     try:
-        order = await api_client.get_order(order_id)
+        order = await _get_order(order_id)
     except APIError as exc:
         if exc.status_code == 404:
             await target.answer(
@@ -63,9 +81,9 @@ async def _show_order(target: Message, order_id: str) -> None:
 # ---------------------------------------------------------------------------
 @router.callback_query(F.data.startswith("order_refresh:"))
 async def cb_order_refresh(callback: CallbackQuery) -> None:
-    order_id = callback.data.split(":")[1]
+    _, _, order_id = callback.data.partition(":")
     try:
-        order = await api_client.get_order(order_id)
+        order = await _get_order(order_id)
     except Exception:
         await callback.answer("Could not refresh order.", show_alert=True)
         return
@@ -83,7 +101,7 @@ async def cb_order_refresh(callback: CallbackQuery) -> None:
 # ---------------------------------------------------------------------------
 @router.callback_query(F.data.startswith("order_cancel:"))
 async def cb_order_cancel(callback: CallbackQuery) -> None:
-    order_id = callback.data.split(":")[1]
+    _, _, order_id = callback.data.partition(":")
     try:
         order = await api_client.cancel_order(order_id)
     except APIError as exc:
@@ -93,9 +111,11 @@ async def cb_order_cancel(callback: CallbackQuery) -> None:
         await callback.answer("Error cancelling order.", show_alert=True)
         return
 
+    # A Refresh right after must not show the cached pre-cancel status
+    await invalidate(_order_key(order_id))
     text = format_order_status(order)
     if callback.message:
         await callback.message.edit_text(
-            text, reply_markup=back_kb("menu:history"), parse_mode="HTML",
+            text, reply_markup=BACK_TO_HISTORY, parse_mode="HTML",
         )
     await callback.answer("Order cancelled.")
@@ -1,7 +1,13 @@
-"""All inline keyboard builders for the bridge bot."""
+"""All inline keyboard builders for the bridge bot.
+
+Builders whose arguments come from a small fixed set are memoised: the
+returned markups are shared and must not be mutated by callers.
+"""
 
 from __future__ import annotations
 
+import functools
+
 from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, WebAppInfo
 
 from bot.config import settings
@@ -27,6 +33,7 @@ CHAIN_EMOJI: dict[str, str] = {
 # ---------------------------------------------------------------------------
 # Main menu
 # ---------------------------------------------------------------------------
+@functools.cache
 def main_menu_kb() -> InlineKeyboardMarkup:
     rows: list[list[InlineKeyboardButton]] = [
         [
@@ -55,6 +62,7 @@ def main_menu_kb() -> InlineKeyboardMarkup:
 # ---------------------------------------------------------------------------
 # Direction selection: first pick "From XMR" or "To XMR"
 # ---------------------------------------------------------------------------
+@functools.cache
 def direction_type_kb() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=[
         [
@@ -74,30 +82,38 @@ def direction_type_kb() -> InlineKeyboardMarkup:
 # ---------------------------------------------------------------------------
 # Chain selection grids (2 columns)
 # ---------------------------------------------------------------------------
+def _chain_rows(direction: str) -> list[list[InlineKeyboardButton]]:
+    """Chain buttons for *direction*, arranged in 2-column rows."""
+    buttons = [
+        InlineKeyboardButton(
+            text=f"{CHAIN_EMOJI.get(sym, '')} {sym}", callback_data=f"chain:{direction}:{sym}",
+        )
+        for sym in DEST_CHAINS
+    ]
+    return [buttons[i : i + 2] for i in range(0, len(buttons), 2)]
+
+
+# DEST_CHAINS and CHAIN_EMOJI are fixed, so both grids are built at import
+_CHAIN_ROWS: dict[str, list[list[InlineKeyboardButton]]] = {
+    direction: _chain_rows(direction) for direction in ("from_xmr", "to_xmr")
+}
+
+
+@functools.lru_cache(maxsize=64)
 def chain_select_kb(direction: str) -> InlineKeyboardMarkup:
     """Build a grid of destination chains.
 
     *direction* is either ``from_xmr`` or ``to_xmr``.
     Callback data: ``chain:<direction>:<SYMBOL>``
     """
-    buttons: list[InlineKeyboardButton] = []
-    for sym in DEST_CHAINS:
-        emoji = CHAIN_EMOJI.get(sym, "")
-        label = f"{emoji} {sym}"
-        buttons.append(
-            InlineKeyboardButton(text=label, callback_data=f"chain:{direction}:{sym}")
-        )
-    # arrange in 2-column rows
-    rows: list[list[InlineKeyboardButton]] = [
-        buttons[i : i + 2] for i in range(0, len(buttons), 2)
-    ]
-    rows.append([back_button("menu:bridge")])
-    return InlineKeyboardMarkup(inline_keyboard=rows)
+    rows = _CHAIN_ROWS.get(direction) or _chain_rows(direction)
+    return InlineKeyboardMarkup(inline_keyboard=[*rows, [BACK_BTN_BRIDGE]])
 
 
 # ---------------------------------------------------------------------------
 # Amount presets
 # ---------------------------------------------------------------------------
+@functools.lru_cache(maxsize=64)
 def amount_presets_kb(from_currency: str) -> InlineKeyboardMarkup:
     """Quick-pick amounts plus a 'custom' option."""
     presets = ["0.1", "0.5", "1.0", "5.0"]
@@ -108,13 +124,14 @@ def amount_presets_kb(from_currency: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=[
         row1,
         [InlineKeyboardButton(text="\u270f\ufe0f Custom amount", callback_data="amount:custom")],
-        [back_button("menu:bridge")],
+        [BACK_BTN_BRIDGE],
     ])
 
 
 # ---------------------------------------------------------------------------
 # Confirm / Cancel
 # ---------------------------------------------------------------------------
+@functools.lru_cache(maxsize=64)
 def confirm_cancel_kb(order_tag: str = "") -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=[
         [
@@ -128,6 +145,12 @@ def confirm_cancel_kb(order_tag: str = "") -> InlineKeyboardMarkup:
 # Slippage selection for /settings
 # ---------------------------------------------------------------------------
 def slippage_kb(current: float = 0.5) -> InlineKeyboardMarkup:
+    # Quantize so near-identical floats share a cache entry
+    return _slippage_kb(round(current, 2))
+
+
+@functools.lru_cache(maxsize=64)
+def _slippage_kb(current: float) -> InlineKeyboardMarkup:
     options = [0.1, 0.3, 0.5, 1.0, 2.0, 3.0]
     buttons: list[InlineKeyboardButton] = []
     for opt in options:
@@ -145,28 +168,39 @@ def slippage_kb(current: float = 0.5) -> InlineKeyboardMarkup:
 # ---------------------------------------------------------------------------
 # Generic back button
 # ---------------------------------------------------------------------------
+@functools.lru_cache(maxsize=16)
 def back_button(callback_data: str = "menu:start") -> InlineKeyboardButton:
     return InlineKeyboardButton(text="\u2b05\ufe0f Back", callback_data=callback_data)
 
 
+@functools.lru_cache(maxsize=64)
 def back_kb(callback_data: str = "menu:start") -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=[
         [back_button(callback_data)],
     ])
 
 
+# Prebuilt back buttons / keyboards for the common destinations
+BACK_BTN_BRIDGE = back_button("menu:bridge")
+BACK_TO_START = back_kb("menu:start")
+BACK_TO_HISTORY = back_kb("menu:history")
+BACK_TO_BRIDGE = back_kb("menu:bridge")
+
+
 # ---------------------------------------------------------------------------
 # Order detail inline (view after tapping history item)
 # ---------------------------------------------------------------------------
+_REFRESH_TEXT = "\U0001f504 Refresh"
+_REFRESH_PREFIX = "order_refresh:"
+_CANCEL_TEXT = "\u274c Cancel order"
+_CANCEL_PREFIX = "order_cancel:"
+
+
 def order_detail_kb(order_id: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=[
         [
-            InlineKeyboardButton(
-                text="\U0001f504 Refresh", callback_data=f"order_refresh:{order_id}",
-            ),
-            InlineKeyboardButton(
-                text="\u274c Cancel order", callback_data=f"order_cancel:{order_id}",
-            ),
+            InlineKeyboardButton(text=_REFRESH_TEXT, callback_data=_REFRESH_PREFIX + order_id),
+            InlineKeyboardButton(text=_CANCEL_TEXT, callback_data=_CANCEL_PREFIX + order_id),
         ],
         [back_button("menu:history")],
     ])
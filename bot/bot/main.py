@@ -4,66 +4,166 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import queue
 import signal
 import sys
-from typing import Any
+from datetime import timedelta
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Callable
 
+import orjson
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
 from aiogram.enums import ParseMode
+from aiogram.filters import Command
+from aiogram.fsm.storage.base import BaseStorage
 from aiogram.fsm.storage.memory import MemoryStorage
-from aiogram.types import BotCommand
+from aiogram.types import BotCommand, Message
 from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
 
 from bot.config import settings
-from bot.handlers import admin, bridge, help as help_, history, rates, settings as settings_, start, status
 from bot.middlewares.logging import LoggingMiddleware
 from bot.middlewares.rate_limit import RateLimitMiddleware
 from bot.services.api_client import api_client
+from bot.services.order_poller import order_poller
+from bot.services.redis_client import disable_redis, get_redis
 
 # ---------------------------------------------------------------------------
 # Logging
 # ---------------------------------------------------------------------------
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    stream=sys.stdout,
-)
+def _start_logging() -> QueueListener:
+    """Route log output through a queue; the caller stops the returned listener.
+
+    Records are still formatted on the calling (event-loop) thread --
+    ``QueueHandler.prepare`` interpolates the message and renders any
+    traceback -- but the blocking write to stdout happens on the listener
+    thread.  Called from :func:`main`, so importing this module neither
+    starts a thread nor reconfigures root logging.
+    """
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    stdout_handler = logging.StreamHandler(sys.stdout)
+    stdout_handler.setFormatter(logging.Formatter(
+        "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+    ))
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter("%(message)s"))  # layout added by the listener
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+    listener = QueueListener(log_queue, stdout_handler, respect_handler_level=True)
+    listener.start()
+    return listener
+
+
 logger = logging.getLogger("bot")
 
 # ---------------------------------------------------------------------------
 # Bot & Dispatcher
 # ---------------------------------------------------------------------------
+class _TelegramSession(AiohttpSession):
+    """AiohttpSession that keeps connections to the Telegram API warm.
+
+    No global cap (the public ``limit`` argument), a large per-host pool and
+    long keep-alive so replies reuse TLS sessions.  aiogram has no argument
+    for the last two, so they go into ``_connector_init`` -- the TCPConnector
+    kwargs dict present throughout the aiogram range pinned in
+    requirements.txt.  If a release drops it, startup fails here instead of
+    silently losing the tuning.
+    """
+
+    def __init__(self, **kwargs: Any) -> None:
+        super().__init__(limit=0, **kwargs)
+        connector_init = getattr(self, "_connector_init", None)
+        if not isinstance(connector_init, dict):
+            raise RuntimeError(
+                "aiogram's AiohttpSession no longer has _connector_init; "
+                "update _TelegramSession for this aiogram version",
+            )
+        connector_init.update(limit_per_host=64, keepalive_timeout=75)
+
+
+# Request and response bodies go through orjson instead of the stdlib json module
+_session = _TelegramSession(
+    json_loads=orjson.loads,
+    json_dumps=lambda obj: orjson.dumps(obj).decode(),
+)
+
 bot = Bot(
     token=settings.BOT_TOKEN,
+    session=_session,
     default=DefaultBotProperties(parse_mode=ParseMode.HTML),
 )
 
-storage = MemoryStorage()
-dp = Dispatcher(storage=storage)
+# FSM records expire after a week of inactivity so Redis memory stays bounded
+FSM_TTL = timedelta(days=7)
 
-# ---------------------------------------------------------------------------
-# Register routers (order matters for FSM state handling in bridge)
-# ---------------------------------------------------------------------------
-dp.include_routers(
-    start.router,
-    bridge.router,
-    status.router,
-    history.router,
-    rates.router,
-    settings_.router,
-    help_.router,
-    admin.router,
-)
 
-# ---------------------------------------------------------------------------
-# Register middlewares on both message and callback_query
-# ---------------------------------------------------------------------------
-dp.message.middleware(LoggingMiddleware())
-dp.message.middleware(RateLimitMiddleware())
-dp.callback_query.middleware(LoggingMiddleware())
-dp.callback_query.middleware(RateLimitMiddleware())
+async def _build_storage() -> BaseStorage:
+    """RedisStorage when REDIS_URL is set and reachable, else MemoryStorage."""
+    redis = get_redis()
+    if redis is None:
+        return MemoryStorage()
+
+    from aiogram.fsm.storage.redis import DefaultKeyBuilder, RedisStorage
+
+    try:
+        await redis.ping()
+    except Exception as exc:
+        logger.warning("Redis unreachable (%s), falling back to in-memory FSM storage", exc)
+        disable_redis()  # response caches follow the same decision
+        return MemoryStorage()
+
+    logger.info("Using Redis FSM storage")
+    return RedisStorage(
+        redis,
+        key_builder=DefaultKeyBuilder(with_bot_id=True),
+        state_ttl=FSM_TTL,
+        data_ttl=FSM_TTL,
+    )
+
+
+def _create_dispatcher(storage: BaseStorage) -> Dispatcher:
+    """Build the dispatcher with all routers, middlewares and lifecycle hooks."""
+    dp = Dispatcher(storage=storage)
+    _register_routers(dp)
+
+    # Register middlewares on both message and callback_query.  Rate limits
+    # share Redis only when the storage check above found it reachable.
+    redis = getattr(storage, "redis", None)
+    rate_limit = RateLimitMiddleware(redis)
+    dp["rate_limit_middleware"] = rate_limit  # closed by on_shutdown
+    dp.message.middleware(LoggingMiddleware())
+    dp.message.middleware(rate_limit)
+    dp.callback_query.middleware(LoggingMiddleware())
+    dp.callback_query.middleware(rate_limit)
+
+    dp.startup.register(on_startup)
+    dp.shutdown.register(on_shutdown)
+    return dp
+
+
+def _register_routers(dp: Dispatcher) -> None:
+    """Import and attach the handler routers.
+
+    Imported here rather than at module level so ``import bot.main`` does
+    not pull in every handler, keyboard and template before it is needed.
+    """
+    from bot.handlers import (
+        admin, bridge, help as help_, history, rates, settings as settings_, start, status,
+    )
+
+    # Register routers (order matters for FSM state handling in bridge)
+    dp.include_routers(
+        start.router,
+        bridge.router,
+        status.router,
+        history.router,
+        rates.router,
+        settings_.router,
+        help_.router,
+        admin.router,
+    )
+    dp.message.register(cmd_bridge, Command("bridge"))
 
 # ---------------------------------------------------------------------------
 # Bot commands for Telegram menu
@@ -81,41 +181,47 @@ BOT_COMMANDS = [
 
 async def on_startup(bot_instance: Bot) -> None:
     """Called once when the bot starts."""
-    await bot_instance.set_my_commands(BOT_COMMANDS)
-    logger.info("Bot commands registered")
-
     if settings.is_webhook_mode:
-        await bot_instance.set_webhook(
+        webhook_call = bot_instance.set_webhook(
             settings.full_webhook_url,
             drop_pending_updates=True,
         )
+    else:
+        webhook_call = bot_instance.delete_webhook(drop_pending_updates=True)
+
+    # Independent Telegram calls -- issue them concurrently
+    await asyncio.gather(bot_instance.set_my_commands(BOT_COMMANDS), webhook_call)
+    logger.info("Bot commands registered")
+    if settings.is_webhook_mode:
         logger.info("Webhook set: %s", settings.full_webhook_url)
     else:
-        await bot_instance.delete_webhook(drop_pending_updates=True)
         logger.info("Polling mode -- webhook removed")
 
+    order_poller.start(bot_instance)
+
 
-async def on_shutdown(bot_instance: Bot) -> None:
+async def on_shutdown(bot_instance: Bot, dispatcher: Dispatcher) -> None:
     """Called once when the bot shuts down."""
     logger.info("Shutting down...")
-    await api_client.close()
-    await bot_instance.session.close()
-
-
-dp.startup.register(on_startup)
-dp.shutdown.register(on_shutdown)
+    await order_poller.stop()  # before the session closes -- it may be mid-send
+    results = await asyncio.gather(
+        dispatcher["rate_limit_middleware"].close(),
+        api_client.close(),
+        dispatcher.storage.close(),
+        bot_instance.session.close(),
+        return_exceptions=True,
+    )
+    for exc in results:
+        if isinstance(exc, Exception):
+            logger.warning("Error during shutdown: %r", exc)
 
 
 # ---------------------------------------------------------------------------
 # /bridge as a slash-command (redirects to the callback flow)
 # ---------------------------------------------------------------------------
-from aiogram.filters import Command  # noqa: E402
-from aiogram.types import Message  # noqa: E402
-from bot.keyboards.inline import direction_type_kb  # noqa: E402
-
-
-@dp.message(Command("bridge"))
 async def cmd_bridge(message: Message) -> None:
+    from bot.keyboards.inline import direction_type_kb
+
     text = (
         "\U0001f504 <b>Select bridge direction</b>\n\n"
         "Are you sending XMR or receiving XMR?"
@@ -126,34 +232,57 @@ async def cmd_bridge(message: Message) -> None:
 # ---------------------------------------------------------------------------
 # Entrypoint
 # ---------------------------------------------------------------------------
+def _loop_factory() -> Callable[[], asyncio.AbstractEventLoop]:
+    """uvloop's event loop; the stdlib default only on Windows (no uvloop there).
+
+    uvloop is a hard requirement elsewhere, so a broken install fails at
+    startup instead of silently running on the slower loop.
+    """
+    if sys.platform == "win32":
+        return asyncio.new_event_loop
+    import uvloop
+
+    return uvloop.new_event_loop
+
+
 def run_polling() -> None:
     """Start the bot in long-polling mode (default)."""
 
     async def _main() -> None:
         logger.info("Starting bot in polling mode...")
+        dp = _create_dispatcher(await _build_storage())
         await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
 
-    asyncio.run(_main())
+    with asyncio.Runner(loop_factory=_loop_factory()) as runner:
+        runner.run(_main())
 
 
 def run_webhook() -> None:
     """Start the bot behind an aiohttp webhook server."""
     from aiohttp import web
 
-    app = web.Application()
-    handler = SimpleRequestHandler(dispatcher=dp, bot=bot)
-    handler.register(app, path=settings.WEBHOOK_PATH)
-    setup_application(app, dp, bot=bot)
+    async def _app() -> web.Application:
+        # Built inside the server's loop so the storage can be awaited
+        dp = _create_dispatcher(await _build_storage())
+        app = web.Application()
+        handler = SimpleRequestHandler(dispatcher=dp, bot=bot)
+        handler.register(app, path=settings.WEBHOOK_PATH)
+        setup_application(app, dp, bot=bot)
+        return app
 
     logger.info("Starting webhook server on 0.0.0.0:8081%s", settings.WEBHOOK_PATH)
-    web.run_app(app, host="0.0.0.0", port=8081)
+    web.run_app(_app(), host="0.0.0.0", port=8081, loop=_loop_factory()())
 
 
 def main() -> None:
-    if settings.is_webhook_mode:
-        run_webhook()
-    else:
-        run_polling()
+    listener = _start_logging()
+    try:
+        if settings.is_webhook_mode:
+            run_webhook()
+        else:
+            run_polling()
+    finally:
+        listener.stop()  # flushes queued records
 
 
 if __name__ == "__main__":
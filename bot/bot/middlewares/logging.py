@@ -11,6 +11,12 @@ from aiogram.types import CallbackQuery, Message, TelegramObject
 
 logger = logging.getLogger("bot.audit")
 
+# Exact event type -> (user_id, description); unknown types are passed through
+_EXTRACTORS: dict[type, Callable[[Any], tuple[int | None, str]]] = {
+    Message: lambda e: (e.from_user.id if e.from_user else None, (e.text or "")[:80]),
+    CallbackQuery: lambda e: (e.from_user.id if e.from_user else None, f"callback:{e.data or ''}"),
+}
+
 
 class LoggingMiddleware(BaseMiddleware):
     """Log user_id, update type, and command text for every handled event."""
@@ -21,16 +27,20 @@ class LoggingMiddleware(BaseMiddleware):
         event: TelegramObject,
         data: dict[str, Any],
     ) -> Any:
+        extractor = _EXTRACTORS.get(type(event))
+        if extractor is None:
+            return await handler(event, data)
+
+        # Audit logging turned off: skip timing and formatting, keep error logs
+        if not logger.isEnabledFor(logging.INFO):
+            try:
+                return await handler(event, data)
+            except Exception:
+                logger.exception("error    | user=%s | %s", *extractor(event))
+                raise
+
         start = time.perf_counter()
-        user_id: int | None = None
-        description = ""
-
-        if isinstance(event, Message):
-            user_id = event.from_user.id if event.from_user else None
-            description = (event.text or "")[:80]
-        elif isinstance(event, CallbackQuery):
-            user_id = event.from_user.id if event.from_user else None
-            description = f"callback:{event.data or ''}"
+        user_id, description = extractor(event)
 
         logger.info(
             "incoming | user=%s | %s",
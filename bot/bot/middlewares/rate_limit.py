@@ -2,102 +2,256 @@
 
 Two independent limits:
   - 30 messages per minute  (all updates)
-  - 3 order-creation actions per hour  (tracked via ``order_created`` flag in handler data)
+  - 3 order-creation actions per hour  (reserved via ``can_create_order``)
+
+With a Redis client both limits are fixed-window ``INCR``+``EXPIRE`` counters
+shared by every worker and kept across restarts; without one (or for any
+call where Redis errors) they fall back to in-process sliding windows.  The middleware puts itself into handler data
+as ``rate_limiter`` (for handlers in ORDER_HANDLER_MODULES) so they can
+reserve order slots.
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import logging
 import time
-from collections import defaultdict
-from typing import Any, Awaitable, Callable
+from collections import defaultdict, deque
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Collection, NamedTuple
 
 from aiogram import BaseMiddleware
 from aiogram.types import CallbackQuery, Message, TelegramObject
+from cachetools import TTLCache
+from redis.exceptions import RedisError
 
 from bot.config import settings
 
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+logger = logging.getLogger(__name__)
+
 # ---------------------------------------------------------------------------
-# Simple sliding-window counters keyed by user_id
+# In-process sliding-window counters keyed by user_id (no-Redis fallback)
 # ---------------------------------------------------------------------------
 
-_msg_buckets: dict[int, list[float]] = defaultdict(list)
-_order_buckets: dict[int, list[float]] = defaultdict(list)
+_msg_buckets: dict[int, deque[float]] = defaultdict(deque)
+_order_buckets: dict[int, deque[float]] = defaultdict(deque)
+
+# Modules whose handlers can create orders (the only ones given order_flag)
+ORDER_HANDLER_MODULES = frozenset({"bot.handlers.bridge"})
 
 MSG_WINDOW = 60.0  # seconds
 ORDER_WINDOW = 3600.0  # seconds
+SWEEP_INTERVAL = 300.0  # seconds between sweeps of idle users' buckets
+
+_sweeper: asyncio.Task[None] | None = None
+
+# Exact event type -> how to tell that user something (alert for callbacks)
+_REPLIES: dict[type, Callable[[Any, str], Awaitable[Any]]] = {
+    Message: lambda e, text: e.answer(text),
+    CallbackQuery: lambda e, text: e.answer(text, show_alert=True),
+}
+_TOO_FAST: dict[type, str] = {
+    Message: "\u26a0\ufe0f You are sending messages too fast. Please wait a moment.",
+    CallbackQuery: "Too many requests. Please slow down.",
+}
+
+
+class OrderSlot(NamedTuple):
+    """An order slot handed out by ``can_create_order``."""
 
+    user_id: int
+    redis_key: str | None  # window key it was counted under; None = local bucket
+    stamp: float  # monotonic time of a local reservation
 
-def _prune(bucket: list[float], window: float, now: float) -> list[float]:
+
+def _prune(bucket: deque[float], window: float, now: float) -> None:
+    """Drop timestamps older than *window* from the left, in place."""
     cutoff = now - window
-    return [ts for ts in bucket if ts > cutoff]
+    while bucket and bucket[0] <= cutoff:
+        bucket.popleft()
+
+
+async def _sweep_loop() -> None:
+    """Periodically forget users whose buckets have fully expired."""
+    while True:
+        await asyncio.sleep(SWEEP_INTERVAL)
+        now = time.monotonic()
+        for buckets, window in ((_msg_buckets, MSG_WINDOW), (_order_buckets, ORDER_WINDOW)):
+            for user_id in list(buckets):
+                _prune(buckets[user_id], window, now)
+                if not buckets[user_id]:
+                    del buckets[user_id]
+
+
+def _allow_message_local(user_id: int) -> bool:
+    """In-process sliding-window message check; starts the sweeper lazily."""
+    global _sweeper
+    if _sweeper is None or _sweeper.done():
+        _sweeper = asyncio.create_task(_sweep_loop(), name="rate-limit-sweeper")
+
+    now = time.monotonic()
+    bucket = _msg_buckets[user_id]
+    _prune(bucket, MSG_WINDOW, now)
+    if len(bucket) >= settings.MAX_MESSAGES_PER_MINUTE:
+        return False
+    bucket.append(now)
+    return True
 
 
 class RateLimitMiddleware(BaseMiddleware):
     """Drop updates that exceed per-user rate limits."""
 
+    def __init__(
+        self,
+        redis: Redis | None = None,
+        order_modules: Collection[str] = ORDER_HANDLER_MODULES,
+    ) -> None:
+        self._redis = redis
+        self._order_modules = frozenset(order_modules)
+        # (user_id, window) pairs already over the message limit -- rejected
+        # locally without another Redis round-trip until the window rolls over
+        self._throttled: TTLCache[tuple[int, int], bool] = TTLCache(
+            maxsize=10_000, ttl=MSG_WINDOW,
+        )
+
     async def __call__(
         self,
         handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
         event: TelegramObject,
         data: dict[str, Any],
     ) -> Any:
-        user_id: int | None = None
-        if isinstance(event, Message) and event.from_user:
-            user_id = event.from_user.id
-        elif isinstance(event, CallbackQuery) and event.from_user:
-            user_id = event.from_user.id
-
-        if user_id is None:
+        kind = type(event)
+        reply = _REPLIES.get(kind)
+        user = event.from_user if reply is not None else None  # type: ignore[attr-defined]
+        if user is None:
             return await handler(event, data)
-
-        now = time.monotonic()
+        user_id: int = user.id
 
         # --- Message rate ---
-        _msg_buckets[user_id] = _prune(_msg_buckets[user_id], MSG_WINDOW, now)
-        if len(_msg_buckets[user_id]) >= settings.MAX_MESSAGES_PER_MINUTE:
-            if isinstance(event, Message):
-                await event.answer(
-                    "\u26a0\ufe0f You are sending messages too fast. Please wait a moment.",
-                )
-            elif isinstance(event, CallbackQuery):
-                await event.answer(
-                    "Too many requests. Please slow down.", show_alert=True,
-                )
+        if not await self._allow_message(user_id):
+            await reply(event, _TOO_FAST[kind])
             return  # drop the update
-        _msg_buckets[user_id].append(now)
+
+        # Handlers that never create orders need none of the bookkeeping below
+        handler_obj = data.get("handler")
+        if handler_obj is None or handler_obj.callback.__module__ not in self._order_modules:
+            return await handler(event, data)
 
         # --- Order rate (checked *after* handler sets flag) ---
         # We inject a mutable dict so the handler can signal an order was created.
         order_flag: dict[str, bool] = {"created": False}
         data["order_flag"] = order_flag
+        data["rate_limiter"] = self
 
         result = await handler(event, data)
 
-        if order_flag["created"]:
-            _order_buckets[user_id] = _prune(
-                _order_buckets[user_id], ORDER_WINDOW, time.monotonic(),
+        # The handler already reserved the slot -- just warn once it was the last one.
+        # Sent as a new message: the handler has already answered the callback
+        # query, and Telegram rejects a second answer.
+        if order_flag["created"] and (
+            await self._orders_in_window(user_id) >= settings.MAX_ORDERS_PER_HOUR
+        ):
+            text = (
+                f"\u26a0\ufe0f You have reached the limit of "
+                f"{settings.MAX_ORDERS_PER_HOUR} orders per hour. "
+                f"Further orders will be rejected until the window resets."
             )
-            if len(_order_buckets[user_id]) >= settings.MAX_ORDERS_PER_HOUR:
-                # The order was already created -- we warn but don't block retroactively
-                if isinstance(event, (Message, CallbackQuery)):
-                    text = (
-                        f"\u26a0\ufe0f You have reached the limit of "
-                        f"{settings.MAX_ORDERS_PER_HOUR} orders per hour. "
-                        f"Further orders will be rejected until the window resets."
-                    )
-                    if isinstance(event, Message):
-                        await event.answer(text)
-                    else:
-                        await event.answer(text, show_alert=True)
-            _order_buckets[user_id].append(time.monotonic())
+            chat = data.get("event_chat")
+            await data["bot"].send_message(chat.id if chat else user_id, text)
 
         return result
 
+    async def close(self) -> None:
+        """Stop the shared bucket sweeper (call from the shutdown hook)."""
+        global _sweeper
+        if _sweeper is not None:
+            _sweeper.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await _sweeper
+            _sweeper = None
+
+    # ------------------------------------------------------------------
+    # Message rate
+    # ------------------------------------------------------------------
+    async def _allow_message(self, user_id: int) -> bool:
+        if self._redis is None:
+            return _allow_message_local(user_id)
+
+        window = int(time.time() // MSG_WINDOW)
+        if (user_id, window) in self._throttled:
+            return False
+        key = f"rl:msg:{user_id}:{window}"
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                count, _ = await pipe.incr(key).expire(key, int(MSG_WINDOW), nx=True).execute()
+        except RedisError as exc:
+            logger.warning("Redis message limit failed, using local window: %s", exc)
+            return _allow_message_local(user_id)
+        if count > settings.MAX_MESSAGES_PER_MINUTE:
+            self._throttled[(user_id, window)] = True
+            return False
+        return True
+
     # ------------------------------------------------------------------
-    # Helper -- called by bridge handler *before* creating the order
+    # Order slots -- reserved by the bridge handler *before* creating the order
     # ------------------------------------------------------------------
     @staticmethod
-    def can_create_order(user_id: int) -> bool:
+    def _order_key(user_id: int) -> str:
+        return f"rl:orders:{user_id}:{int(time.time() // ORDER_WINDOW)}"
+
+    async def _orders_in_window(self, user_id: int) -> int:
+        if self._redis is not None:
+            try:
+                return int(await self._redis.get(self._order_key(user_id)) or 0)
+            except RedisError as exc:
+                logger.warning("Redis order count failed, using local window: %s", exc)
+        bucket = _order_buckets[user_id]
+        _prune(bucket, ORDER_WINDOW, time.monotonic())
+        return len(bucket)
+
+    async def can_create_order(self, user_id: int) -> OrderSlot | None:
+        """Atomically reserve one order slot; None when the hourly limit is hit.
+
+        The returned slot records exactly where it was reserved, so
+        :meth:`release_order_slot` gives back that reservation even if the
+        hour has rolled over or Redis has failed in between.
+        """
+        if self._redis is not None:
+            key = self._order_key(user_id)
+            try:
+                async with self._redis.pipeline(transaction=True) as pipe:
+                    count, _ = await pipe.incr(key).expire(
+                        key, int(ORDER_WINDOW), nx=True,
+                    ).execute()
+            except RedisError as exc:
+                logger.warning("Redis order reservation failed, using local window: %s", exc)
+            else:
+                if count > settings.MAX_ORDERS_PER_HOUR:
+                    return None
+                return OrderSlot(user_id, key, 0.0)
+
         now = time.monotonic()
-        _order_buckets[user_id] = _prune(_order_buckets[user_id], ORDER_WINDOW, now)
-        return len(_order_buckets[user_id]) < settings.MAX_ORDERS_PER_HOUR
+        bucket = _order_buckets[user_id]
+        _prune(bucket, ORDER_WINDOW, now)
+        if len(bucket) >= settings.MAX_ORDERS_PER_HOUR:
+            return None
+        bucket.append(now)
+        return OrderSlot(user_id, None, now)
+
+    async def release_order_slot(self, slot: OrderSlot) -> None:
+        """Give back a slot reserved for an order that was never created."""
+        if slot.redis_key is None:
+            with contextlib.suppress(ValueError):
+                _order_buckets[slot.user_id].remove(slot.stamp)
+            return
+        if self._redis is None:
+            return
+        key = slot.redis_key
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                await pipe.decr(key).expire(key, int(ORDER_WINDOW), nx=True).execute()
+        except RedisError as exc:
+            logger.warning("Redis order release failed, slot stays used: %s", exc)
@@ -2,12 +2,22 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any
+import random
+import time
+import weakref
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Callable
 
+import aiohttp
 import httpx
+import msgspec
+import orjson
 
 from bot.config import settings
+from bot.services.models import ORDER_DECODER, ORDER_LIST_DECODER, RATE_DECODER, Order, Rate
+from bot.utils.async_ttl import async_ttl_cache
 
 logger = logging.getLogger(__name__)
 
@@ -15,11 +25,41 @@ logger = logging.getLogger(__name__)
 # Retry / timeout policy
 # ---------------------------------------------------------------------------
 _TIMEOUT = httpx.Timeout(connect=5.0, read=15.0, write=10.0, pool=5.0)
+# HTTP/2 multiplexes concurrent requests over a few sockets, so the pool is
+# small; idle sockets outlive the poll intervals so polls reuse warm TLS.
+_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=10, keepalive_expiry=30.0)
 _MAX_RETRIES = 2
+_RETRY_BASE = 0.25  # seconds; backoff ceiling doubles per attempt
+_RETRY_MAX = 15.0  # seconds; also caps server-requested Retry-After waits
+_THROTTLE_ALPHA = 0.1  # EWMA weight of the latest response in the 429 rate
+_THROTTLE_THRESHOLD = 0.2  # above this 429 rate, new requests are paced
+
+
+def _retry_after(resp: httpx.Response) -> float | None:
+    """Seconds requested by a ``Retry-After`` header (delta or HTTP-date)."""
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _backoff_delay(attempt: int, minimum: float | None = None) -> float:
+    """Exponential backoff with full jitter, at least *minimum* (capped)."""
+    delay = random.random() * min(_RETRY_BASE * 2 ** (attempt + 1), _RETRY_MAX)
+    if minimum is not None:
+        delay = max(delay, min(minimum, _RETRY_MAX))
+    return delay
 
 
 class APIError(Exception):
-    """Raised when the backend returns an unexpected status."""
+    """Raised when the backend returns an unexpected status or an undecodable body."""
 
     def __init__(self, status_code: int, detail: str = ""):
         self.status_code = status_code
@@ -28,16 +68,48 @@ class APIError(Exception):
 
 
 class BridgeAPIClient:
-    """Thin wrapper around httpx.AsyncClient that speaks to the bridge backend."""
+    """Thin wrapper around httpx.AsyncClient that speaks to the bridge backend.
+
+    A single pooled HTTP/2 client is shared by every handler, so requests
+    reuse warm connections instead of paying a TCP/TLS handshake each.
+
+    The client also tracks an EWMA of how often the backend answers 429.
+    While that rate is high it delays outgoing requests and stretches
+    retry waits, so a throttling backend gets slower traffic instead of a
+    burst of retries.
+
+    The bot runs on uvloop (see ``main._loop_factory``); keep it in
+    requirements.txt -- keep-alive request chains like the order poller's
+    are markedly slower on the stdlib selector loop.
+    """
 
     def __init__(self) -> None:
         self._client: httpx.AsyncClient | None = None
+        # Separate aiohttp session for the push channel (httpx has no WebSockets)
+        self._ws_session: aiohttp.ClientSession | None = None
+        # Loop the client's connections belong to (weak, so a finished loop
+        # is not kept alive by the singleton)
+        self._loop: weakref.ref[asyncio.AbstractEventLoop] | None = None
+        self._recent_429_rate = 0.0
+        # Cleared once the backend shows it has no ``ids`` filter on /api/orders
+        self._bulk_supported = True
+        # Cleared on the first 404/405 from /api/users/{id}/stats
+        self._user_stats_supported = True
 
     async def _get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._loop is not None and self._loop() is not loop:
+            # Pooled sockets are bound to the loop that opened them and cannot
+            # be closed from this one -- drop the clients and start fresh
+            self._client = None
+            self._ws_session = None
         if self._client is None or self._client.is_closed:
+            self._loop = weakref.ref(loop)
             self._client = httpx.AsyncClient(
                 base_url=settings.API_BASE_URL,
                 timeout=_TIMEOUT,
+                limits=_LIMITS,
+                http2=True,
                 headers={"User-Agent": "XMRBridgeBot/1.0"},
             )
         return self._client
@@ -45,7 +117,11 @@ class BridgeAPIClient:
     async def close(self) -> None:
         if self._client and not self._client.is_closed:
             await self._client.aclose()
-            self._client = None
+        if self._ws_session and not self._ws_session.closed:
+            await self._ws_session.close()
+        self._client = None
+        self._ws_session = None
+        self._loop = None
 
     # ------------------------------------------------------------------
     # Generic request helper with retries
@@ -57,41 +133,54 @@ class BridgeAPIClient:
         *,
         json: dict[str, Any] | None = None,
         params: dict[str, Any] | None = None,
-    ) -> dict[str, Any] | list[Any]:
+        loads: Callable[[bytes], Any] = orjson.loads,
+    ) -> Any:
         client = await self._get_client()
         last_exc: Exception | None = None
 
         for attempt in range(_MAX_RETRIES + 1):
             try:
+                throttle = self._recent_429_rate
+                if throttle > _THROTTLE_THRESHOLD:
+                    await asyncio.sleep(_backoff_delay(0) * (1 + throttle))
                 resp = await client.request(method, path, json=json, params=params)
+                self._recent_429_rate += _THROTTLE_ALPHA * (
+                    (resp.status_code == 429) - self._recent_429_rate
+                )
+                if resp.status_code == 429 and attempt < _MAX_RETRIES:
+                    logger.warning(
+                        "Backend %s %s rate-limited us, retrying (%d/%d)",
+                        method, path, attempt + 1, _MAX_RETRIES,
+                    )
+                    delay = _backoff_delay(attempt, _retry_after(resp))
+                    await asyncio.sleep(min(delay * (1 + self._recent_429_rate), _RETRY_MAX))
+                    continue
                 if resp.status_code >= 500 and attempt < _MAX_RETRIES:
                     logger.warning(
                         "Backend %s %s returned %s, retrying (%d/%d)",
                         method, path, resp.status_code, attempt + 1, _MAX_RETRIES,
                     )
+                    await asyncio.sleep(_backoff_delay(attempt, _retry_after(resp)))
                     continue
                 if resp.status_code >= 400:
-                    detail = resp.text[:300]
                     try:
-                        detail = resp.json().get("detail", detail)
-                    except Exception:
-                        pass
+                        detail = orjson.loads(resp.content).get("detail") or resp.text[:300]
+                    except (ValueError, AttributeError):  # not JSON / not an object
+                        detail = resp.content[:300].decode("utf-8", "replace")
                     raise APIError(resp.status_code, str(detail))
-                return resp.json()
-            except httpx.HTTPStatusError as exc:
-                last_exc = exc
-                if attempt < _MAX_RETRIES:
-                    continue
-            except httpx.TimeoutException as exc:
-                last_exc = exc
-                logger.warning("Timeout on %s %s (attempt %d)", method, path, attempt + 1)
-                if attempt < _MAX_RETRIES:
-                    continue
-            except httpx.HTTPError as exc:
+                try:
+                    return loads(resp.content)
+                except (msgspec.DecodeError, ValueError) as exc:  # incl. ValidationError
+                    raise APIError(resp.status_code, f"invalid response body: {exc}") from exc
+            except httpx.HTTPError as exc:  # incl. TimeoutException, HTTPStatusError
                 last_exc = exc
-                logger.error("HTTP error on %s %s: %s", method, path, exc)
-                if attempt < _MAX_RETRIES:
-                    continue
+                if isinstance(exc, httpx.TimeoutException):
+                    logger.warning("Timeout on %s %s (attempt %d)", method, path, attempt + 1)
+                elif not isinstance(exc, httpx.HTTPStatusError):
+                    logger.error("HTTP error on %s %s: %s", method, path, exc)
+                if attempt >= _MAX_RETRIES:
+                    break
+                await asyncio.sleep(_backoff_delay(attempt))
 
         raise last_exc or RuntimeError("request failed with no exception captured")
 
@@ -99,14 +188,17 @@ class BridgeAPIClient:
     # Public API methods
     # ------------------------------------------------------------------
 
-    async def fetch_rate(self, from_currency: str, to_currency: str) -> dict[str, Any]:
-        """GET /api/rates?from=XMR&to=TON  ->  {rate, change_24h, ...}"""
+    @async_ttl_cache(ttl=5)
+    async def fetch_rate(self, from_currency: str, to_currency: str) -> Rate:
+        """GET /api/rates?from=XMR&to=TON  ->  Rate(rate, change_24h, fee_pct)"""
         data = await self._request(
             "GET", "/api/rates",
             params={"from_currency": from_currency, "to_currency": to_currency},
+            loads=RATE_DECODER.decode,
         )
         return data  # type: ignore[return-value]
 
+    @async_ttl_cache(ttl=30)
     async def fetch_all_rates(self) -> list[dict[str, Any]]:
         """GET /api/rates/all  ->  list of rate objects."""
         data = await self._request("GET", "/api/rates/all")
@@ -121,7 +213,7 @@ class BridgeAPIClient:
         amount: float,
         destination_address: str,
         slippage: float = 0.5,
-    ) -> dict[str, Any]:
+    ) -> Order:
         """POST /api/orders  ->  order object with deposit_address."""
         payload = {
             "tg_user_id": tg_user_id,
@@ -131,39 +223,154 @@ class BridgeAPIClient:
             "destination_address": destination_address,
             "slippage": slippage,
         }
-        data = await self._request("POST", "/api/orders", json=payload)
+        data = await self._request(
+            "POST", "/api/orders", json=payload, loads=ORDER_DECODER.decode,
+        )
         return data  # type: ignore[return-value]
 
-    async def get_order(self, order_id: str) -> dict[str, Any]:
+    async def get_order(self, order_id: str) -> Order:
         """GET /api/orders/{order_id}."""
-        data = await self._request("GET", f"/api/orders/{order_id}")
+        data = await self._request(
+            "GET", f"/api/orders/{order_id}", loads=ORDER_DECODER.decode,
+        )
         return data  # type: ignore[return-value]
 
+    async def get_orders_bulk(self, order_ids: list[str]) -> list[Order]:
+        """GET /api/orders?ids=a,b,c  ->  the listed orders in one round trip.
+
+        Any id missing from the bulk response is fetched with its own GET.
+        Once the backend shows it has no ``ids`` filter (a 4xx, a body that is
+        not an order list, or orders that were not asked for), bulk requests
+        stop for good and every order is fetched individually.
+        """
+        if not order_ids:
+            return []
+        wanted = set(order_ids)
+        found: list[Order] = []
+        if self._bulk_supported:
+            try:
+                data: list[Order] = await self._request(
+                    "GET", "/api/orders", params={"ids": ",".join(order_ids)},
+                    loads=ORDER_LIST_DECODER.decode,
+                )
+            except APIError as exc:
+                # Any 4xx means the ids filter was refused; a 2xx here means
+                # the body was not an order list.  5xx and 429 are transient.
+                if exc.status_code >= 500 or exc.status_code == 429:
+                    raise
+                data = []
+                self._bulk_supported = False
+            found = [o for o in data if o.id in wanted]
+            if len(found) < len(data):
+                self._bulk_supported = False  # filter ignored -- got a generic page
+            if not self._bulk_supported:
+                logger.info("Backend ignores /api/orders?ids=; fetching orders one by one")
+
+        seen = {o.id for o in found}
+        missing = [oid for oid in order_ids if oid not in seen]
+        if missing:
+            results = await asyncio.gather(
+                *(self.get_order(oid) for oid in missing), return_exceptions=True,
+            )
+            found.extend(r for r in results if not isinstance(r, BaseException))
+        return found
+
+    async def order_updates(self, order_id: str) -> AsyncIterator[str]:
+        """Yield push messages from the backend's ``/v1/ws/order/{id}`` channel.
+
+        Each message is the raw JSON the backend published for the order.
+        Iteration ends when the server closes the socket; an unreachable
+        channel raises ``aiohttp.ClientError`` (``WSServerHandshakeError``
+        carries the HTTP status when the route is missing).
+        """
+        await self._get_client()  # resets both sessions if the loop changed
+        if self._ws_session is None or self._ws_session.closed:
+            self._ws_session = aiohttp.ClientSession(
+                headers={"User-Agent": "XMRBridgeBot/1.0"},
+            )
+        base = settings.API_BASE_URL.rstrip("/").replace("http", "ws", 1)
+        async with self._ws_session.ws_connect(
+            f"{base}/v1/ws/order/{order_id}", heartbeat=30.0,
+        ) as ws:
+            async for msg in ws:
+                if msg.type is aiohttp.WSMsgType.TEXT:
+                    yield msg.data
+                elif msg.type is aiohttp.WSMsgType.ERROR:
+                    break
+
     async def list_orders(
         self, tg_user_id: int, *, limit: int = 10, offset: int = 0,
-    ) -> list[dict[str, Any]]:
+    ) -> list[Order]:
         """GET /api/orders?tg_user_id=...&limit=...&offset=..."""
         data = await self._request(
             "GET", "/api/orders",
             params={"tg_user_id": tg_user_id, "limit": limit, "offset": offset},
+            loads=ORDER_LIST_DECODER.decode,
         )
         return data  # type: ignore[return-value]
 
-    async def cancel_order(self, order_id: str) -> dict[str, Any]:
+    async def get_user_stats(self, tg_user_id: int) -> dict[str, Any]:
+        """GET /api/users/{tg_user_id}/stats  ->  aggregated order stats.
+
+        Returns ``orders_total``, ``orders_completed`` and ``xmr_volume``
+        (sum of ``amount_in`` over completed orders).  Falls back to
+        aggregating the last 100 orders when the backend lacks the endpoint,
+        and stops probing for it after the first 404/405.
+        """
+        if self._user_stats_supported:
+            try:
+                data = await self._request("GET", f"/api/users/{tg_user_id}/stats")
+            except APIError as exc:
+                if exc.status_code not in (404, 405):
+                    raise
+                logger.info("Backend has no per-user stats endpoint; aggregating orders")
+                self._user_stats_supported = False
+            else:
+                return data  # type: ignore[return-value]
+
+        orders = await self.list_orders(tg_user_id, limit=100)
+        completed = [o for o in orders if o.status == "completed"]
+        return {
+            "orders_total": len(orders),
+            "orders_completed": len(completed),
+            "xmr_volume": sum(float(o.amount_in or 0) for o in completed),
+        }
+
+    async def cancel_order(self, order_id: str) -> Order:
         """POST /api/orders/{order_id}/cancel."""
-        data = await self._request("POST", f"/api/orders/{order_id}/cancel")
+        data = await self._request(
+            "POST", f"/api/orders/{order_id}/cancel", loads=ORDER_DECODER.decode,
+        )
         return data  # type: ignore[return-value]
 
+    # Admin dashboard: fresh for 10s, then served stale for up to 60s while
+    # a background refresh runs
+    @async_ttl_cache(ttl=10, stale_ttl=60)
     async def get_stats(self) -> dict[str, Any]:
         """GET /api/admin/stats  ->  aggregated stats for admin panel."""
         data = await self._request("GET", "/api/admin/stats")
         return data  # type: ignore[return-value]
 
-    async def get_pending_orders(self) -> list[dict[str, Any]]:
+    @async_ttl_cache(ttl=10, stale_ttl=60)
+    async def get_pending_orders(self) -> list[Order]:
         """GET /api/admin/orders/pending."""
-        data = await self._request("GET", "/api/admin/orders/pending")
+        data = await self._request(
+            "GET", "/api/admin/orders/pending", loads=ORDER_LIST_DECODER.decode,
+        )
         return data  # type: ignore[return-value]
 
+    async def get_admin_bundle(self) -> dict[str, Any]:
+        """Admin dashboard data: ``{"stats": ..., "pending": [...]}``.
+
+        Both requests are in flight at once (multiplexed over one HTTP/2
+        connection).  A section that failed holds its exception instead of
+        a value, so the other can still be shown.
+        """
+        stats, pending = await asyncio.gather(
+            self.get_stats(), self.get_pending_orders(), return_exceptions=True,
+        )
+        return {"stats": stats, "pending": pending}
+
 
 # Singleton instance -- import this everywhere
 api_client = BridgeAPIClient()
@@ -0,0 +1,41 @@
+"""Typed backend payloads, decoded straight from JSON bytes with msgspec."""
+
+from __future__ import annotations
+
+import msgspec
+
+
+class Order(msgspec.Struct, gc=False):
+    """A bridge order as returned by the ``/api/orders`` endpoints.
+
+    Amounts may arrive as numbers or decimal strings; both are passed
+    through to the formatters unchanged.  Unknown fields are ignored.
+    Fields only ever hold scalars, so instances are left untracked by the
+    cyclic garbage collector.
+    """
+
+    id: str
+    status: str = "pending"
+    from_currency: str = "XMR"
+    to_currency: str = "???"
+    amount_in: float | str | None = None
+    amount_out: float | str | None = None
+    deposit_address: str | None = None
+    destination_address: str | None = None
+    fee: float | str | None = None
+    created_at: str | None = None
+
+
+class Rate(msgspec.Struct, gc=False):
+    """A single-pair quote from ``/api/rates``.  Unknown fields are ignored."""
+
+    rate: float | None = None
+    change_24h: float | None = None
+    fee_pct: float = 0.5
+
+
+# Reusable decoders -- building one per call would redo the schema setup
+ORDER_DECODER = msgspec.json.Decoder(Order)
+ORDER_LIST_DECODER = msgspec.json.Decoder(list[Order])
+# Lax mode: numeric strings ("52.3") are accepted for the float fields
+RATE_DECODER = msgspec.json.Decoder(Rate, strict=False)
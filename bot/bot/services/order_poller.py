@@ -0,0 +1,192 @@
+"""Process-wide poller that watches in-flight orders and notifies their owners.
+
+Instead of one background task (and one HTTP request) per order, every
+watched order is checked with a single bulk request per polling interval.
+Where the backend's per-order push channel is available, an update on it
+wakes the poller early, so status changes are delivered without waiting
+out the interval; the interval poll remains the fallback.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+
+import aiohttp
+from aiogram import Bot
+
+from bot.config import settings
+from bot.services.api_client import api_client
+from bot.services.models import Order
+from bot.utils.formatters import format_order_status
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = {"completed", "failed", "refunded", "expired", "cancelled"}
+MAX_WATCH_SECONDS = 3 * 3600  # stop watching an order after 3 hours
+BULK_BATCH_SIZE = 100  # order ids per bulk request
+MAX_CONCURRENT_SENDS = 20  # in-flight Telegram sends per poll cycle
+MAX_PUSH_SUBSCRIPTIONS = 100  # open push sockets; further orders are only polled
+PUSH_DEBOUNCE = 1.0  # seconds to gather a burst of pushes into one poll
+
+
+class OrderPoller:
+    """Batch-poll watched orders and message the user on status transitions."""
+
+    def __init__(self) -> None:
+        # order_id -> (chat_id, last_status, hash of last sent text, watch deadline)
+        self._active: dict[str, tuple[int, str | None, int | None, float]] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._send_sem = asyncio.Semaphore(MAX_CONCURRENT_SENDS)
+        # Set by push listeners to run the next poll cycle immediately
+        self._wake = asyncio.Event()
+        self._push: dict[str, asyncio.Task[None]] = {}
+        self._push_supported = True  # cleared once the backend lacks the route
+
+    def watch(self, order_id: str, chat_id: int) -> None:
+        """Start watching *order_id*; updates are sent to *chat_id*."""
+        deadline = asyncio.get_running_loop().time() + MAX_WATCH_SECONDS
+        self._active[order_id] = (chat_id, None, None, deadline)
+        self._subscribe(order_id)
+
+    def start(self, bot: Bot) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(bot), name="order-poller")
+
+    async def stop(self) -> None:
+        for task in list(self._push.values()):
+            task.cancel()
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    # ------------------------------------------------------------------
+    # Push channel -- wakes the polling loop early
+    # ------------------------------------------------------------------
+    def _subscribe(self, order_id: str) -> None:
+        if not self._push_supported or order_id in self._push:
+            return
+        if len(self._push) >= MAX_PUSH_SUBSCRIPTIONS:
+            return
+        task = asyncio.create_task(self._listen(order_id), name=f"order-push:{order_id}")
+        self._push[order_id] = task
+
+        def forget(done: asyncio.Task[None]) -> None:
+            if self._push.get(order_id) is done:
+                del self._push[order_id]
+
+        task.add_done_callback(forget)
+
+    def _unsubscribe(self, order_id: str) -> None:
+        task = self._push.pop(order_id, None)
+        if task is not None:
+            task.cancel()
+
+    async def _listen(self, order_id: str) -> None:
+        try:
+            async with contextlib.aclosing(api_client.order_updates(order_id)) as updates:
+                async for _ in updates:
+                    self._wake.set()
+        except aiohttp.WSServerHandshakeError as exc:
+            if exc.status in (404, 405):
+                logger.info("Backend has no order push channel; polling only")
+                self._push_supported = False
+        except (aiohttp.ClientError, asyncio.TimeoutError) as exc:
+            logger.debug("Push channel for order %s closed: %s", order_id, exc)
+
+    # ------------------------------------------------------------------
+    # Polling loop
+    # ------------------------------------------------------------------
+    async def _run(self, bot: Bot) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), settings.STATUS_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            else:
+                await asyncio.sleep(PUSH_DEBOUNCE)
+            self._wake.clear()
+            if not self._active:
+                continue
+            try:
+                await self._poll_once(bot)
+            except Exception:
+                logger.exception("Order poll cycle failed")
+
+    async def _fetch_watched(self) -> list[Order]:
+        """Fetch every watched order, BULK_BATCH_SIZE ids per request."""
+        ids = list(self._active)
+        batches = [ids[i:i + BULK_BATCH_SIZE] for i in range(0, len(ids), BULK_BATCH_SIZE)]
+        results = await asyncio.gather(
+            *(api_client.get_orders_bulk(batch) for batch in batches),
+            return_exceptions=True,
+        )
+        orders: list[Order] = []
+        for batch, result in zip(batches, results):
+            if isinstance(result, BaseException):
+                logger.warning("Bulk poll failed for %d orders", len(batch))
+                continue
+            orders.extend(result)
+        return orders
+
+    async def _send(self, bot: Bot, chat_id: int, text: str) -> None:
+        async with self._send_sem:
+            try:
+                await bot.send_message(chat_id, text, parse_mode="HTML")
+            except Exception:
+                logger.warning("Failed to send status update to %s", chat_id)
+
+    async def _poll_once(self, bot: Bot) -> None:
+        orders = await self._fetch_watched()
+
+        sends = []
+        for order in orders:
+            order_id = order.id
+            entry = self._active.get(order_id)
+            if entry is None:
+                continue
+            chat_id, previous_status, last_hash, deadline = entry
+            status = order.status
+            if status == previous_status:
+                continue
+
+            # Skip the send when the rendered message is identical to the last one
+            text = format_order_status(order)
+            text_hash = hash(text)
+            if status in TERMINAL_STATUSES:
+                del self._active[order_id]
+                self._unsubscribe(order_id)
+            else:
+                self._active[order_id] = (chat_id, status, text_hash, deadline)
+            if text_hash == last_hash:
+                continue
+
+            # Notify on meaningful transitions
+            sends.append(self._send(bot, chat_id, text))
+
+        # Sends run concurrently, at most MAX_CONCURRENT_SENDS at a time
+        await asyncio.gather(*sends)
+        await self._expire(bot)
+
+    async def _expire(self, bot: Bot) -> None:
+        now = asyncio.get_running_loop().time()
+        expired = [oid for oid, entry in self._active.items() if entry[3] <= now]
+        for order_id in expired:
+            chat_id = self._active.pop(order_id)[0]
+            self._unsubscribe(order_id)
+            try:
+                await bot.send_message(
+                    chat_id,
+                    f"\u23f0 Status polling timed out for order <code>{order_id}</code>. "
+                    f"Use /status {order_id} to check manually.",
+                    parse_mode="HTML",
+                )
+            except Exception:
+                pass
+
+
+# Singleton instance -- started/stopped by the bot lifecycle hooks in main.py
+order_poller = OrderPoller()
@@ -0,0 +1,44 @@
+"""Shared async Redis connection (optional -- enabled by REDIS_URL)."""
+
+from __future__ import annotations
+
+import functools
+from typing import TYPE_CHECKING
+
+from bot.config import settings
+
+if TYPE_CHECKING:
+    from redis.asyncio import Redis
+
+
+# Set at startup when the configured server does not answer a ping
+_disabled = False
+
+
+@functools.cache
+def _connect() -> Redis:
+    from redis.asyncio import Redis
+
+    return Redis.from_url(settings.REDIS_URL)
+
+
+def get_redis() -> Redis | None:
+    """Return the process-wide Redis client, or None when REDIS_URL is unset
+    or Redis was found unreachable at startup (see :func:`disable_redis`).
+
+    The client connects lazily on first command, so calling this is cheap.
+    """
+    if not settings.REDIS_URL or _disabled:
+        return None
+    return _connect()
+
+
+def disable_redis() -> None:
+    """Treat Redis as absent for the rest of the process.
+
+    Called by the startup hook when the ping fails, so the caches make the
+    same in-memory fallback as FSM storage instead of paying a failed
+    connection attempt on every call.
+    """
+    global _disabled
+    _disabled = True
@@ -0,0 +1,188 @@
+"""TTL caches for async functions and ad-hoc awaitables."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import time
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+import msgspec
+import orjson
+from cachetools import TLRUCache
+
+from bot.services.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Without stale_ttl, a failed refresh may serve a value up to this many ttls old
+STALE_ON_ERROR_TTLS = 3
+
+
+def async_ttl_cache(
+    ttl: float,
+    *,
+    stale_ttl: float | None = None,
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Cache the result of a coroutine function for *ttl* seconds.
+
+    Entries are keyed by the call arguments.  Concurrent callers with the same
+    key share a single in-flight call (single-flight), and when a refresh
+    fails the last good value is served instead, as long as it is younger
+    than *stale_ttl* (or ``STALE_ON_ERROR_TTLS * ttl``).  Past that age the
+    error propagates, so callers never show arbitrarily old data.
+
+    With *stale_ttl* (stale-while-revalidate), an entry older than *ttl* but
+    younger than *stale_ttl* is returned immediately while one background
+    task per key refreshes it for the next caller.
+    """
+    max_stale = stale_ttl if stale_ttl is not None else ttl * STALE_ON_ERROR_TTLS
+
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        entries: dict[Hashable, tuple[float, T]] = {}
+        locks: dict[Hashable, asyncio.Lock] = {}
+        # Keys with a background refresh in flight, and the tasks themselves
+        # (held so they are not garbage-collected mid-run)
+        refreshing: set[Hashable] = set()
+        tasks: set[asyncio.Task[None]] = set()
+
+        async def refresh(key: Hashable, args: tuple, kwargs: dict[str, Any]) -> None:
+            try:
+                async with locks.setdefault(key, asyncio.Lock()):
+                    entry = entries.get(key)
+                    if entry is not None and entry[0] > time.monotonic():
+                        return
+                    value = await func(*args, **kwargs)
+                    entries[key] = (time.monotonic() + ttl, value)
+            except Exception as exc:
+                logger.warning("%s background refresh failed (%s)", func.__qualname__, exc)
+            finally:
+                refreshing.discard(key)
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            key: Hashable = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+            entry = entries.get(key)
+            now = time.monotonic()
+            if entry is not None and entry[0] > now:
+                logger.debug("cache HIT %s%r", func.__qualname__, key)
+                return entry[1]
+            if (
+                entry is not None
+                and stale_ttl is not None
+                and entry[0] - ttl + stale_ttl > now
+            ):
+                logger.debug("cache STALE %s%r", func.__qualname__, key)
+                if key not in refreshing:
+                    refreshing.add(key)
+                    task = asyncio.create_task(refresh(key, args, kwargs))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                return entry[1]
+
+            lock = locks.setdefault(key, asyncio.Lock())
+            async with lock:
+                # Another caller may have refreshed the entry while we waited
+                entry = entries.get(key)
+                if entry is not None and entry[0] > time.monotonic():
+                    logger.debug("cache HIT %s%r", func.__qualname__, key)
+                    return entry[1]
+                logger.debug("cache MISS %s%r", func.__qualname__, key)
+                try:
+                    value = await func(*args, **kwargs)
+                except Exception as exc:
+                    # entry[0] - ttl is when the entry was stored
+                    if entry is None or entry[0] - ttl + max_stale <= time.monotonic():
+                        raise
+                    logger.warning(
+                        "%s failed (%s), serving stale value", func.__qualname__, exc,
+                    )
+                    return entry[1]
+                entries[key] = (time.monotonic() + ttl, value)
+                return value
+
+        wrapper.cache_clear = entries.clear  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
+
+
+# ---------------------------------------------------------------------------
+# Keyed request coalescing
+# ---------------------------------------------------------------------------
+# key -> (ttl, value); each entry expires ttl seconds after it was stored
+_results: TLRUCache[str, tuple[float, Any]] = TLRUCache(
+    maxsize=10_000, ttu=lambda _key, entry, now: now + entry[0], timer=time.monotonic,
+)
+_inflight: dict[str, asyncio.Task[Any]] = {}
+
+
+async def cached(
+    key: str,
+    ttl: float,
+    coro_factory: Callable[[], Awaitable[T]],
+    *,
+    loads: Callable[[bytes], Any] = orjson.loads,
+) -> T:
+    """Return the value for *key*, calling ``coro_factory()`` at most once per *ttl*.
+
+    Concurrent callers with the same key await one shared call, and results
+    are kept for *ttl* seconds.  When Redis is configured the JSON-encoded
+    result is stored there too, so every worker shares it; *loads* turns
+    that JSON back into the factory's return type.  Errors are not cached.
+    """
+    entry = _results.get(key)
+    if entry is not None:
+        return entry[1]
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_load(key, ttl, coro_factory, loads))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # Shielded so one impatient caller cannot cancel the call for the others
+    return await asyncio.shield(task)
+
+
+async def _load(
+    key: str,
+    ttl: float,
+    coro_factory: Callable[[], Awaitable[T]],
+    loads: Callable[[bytes], Any],
+) -> T:
+    redis = get_redis()
+    redis_key = f"cache:{key}"
+    if redis is not None:
+        try:
+            raw = await redis.get(redis_key)
+        except Exception as exc:
+            logger.debug("Redis cache read for %s failed: %s", key, exc)
+            raw = None
+        if raw is not None:
+            value = loads(raw)
+            _results[key] = (ttl, value)
+            return value
+
+    value = await coro_factory()
+    _results[key] = (ttl, value)
+    if redis is not None:
+        try:
+            # msgspec also encodes Structs, which orjson does not
+            await redis.set(redis_key, msgspec.json.encode(value), px=int(ttl * 1000))
+        except Exception as exc:
+            logger.debug("Redis cache write for %s failed: %s", key, exc)
+    return value
+
+
+async def invalidate(key: str) -> None:
+    """Drop *key* from the local and (when configured) Redis cache."""
+    _results.pop(key, None)
+    redis = get_redis()
+    if redis is not None:
+        try:
+            await redis.delete(f"cache:{key}")
+        except Exception as exc:
+            logger.debug("Redis cache delete for %s failed: %s", key, exc)
@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
-from typing import Any
+import functools
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from bot.services.models import Order
 
 # ---------------------------------------------------------------------------
 # Emoji mapping for order statuses
@@ -19,6 +23,8 @@ STATUS_EMOJI: dict[str, str] = {
     "expired": "\u23f0",               # alarm clock
     "cancelled": "\U0001f6ab",         # prohibited
 }
+# Display labels for the known statuses, e.g. "awaiting_deposit" -> "Awaiting Deposit"
+_STATUS_LABEL: dict[str, str] = {s: s.replace("_", " ").title() for s in STATUS_EMOJI}
 
 # Progress bar stages (ordered)
 PROGRESS_STAGES = [
@@ -29,6 +35,46 @@ PROGRESS_STAGES = [
     "sending",
     "completed",
 ]
+_STAGE_INDEX: dict[str, int] = {stage: i for i, stage in enumerate(PROGRESS_STAGES)}
+
+
+def _progress_bar(idx: int) -> str:
+    return " ".join(
+        "\u2705" if i < idx            # done
+        else "\U0001f7e2" if i == idx  # green circle = current
+        else "\u26aa"                  # white circle
+        for i in range(len(PROGRESS_STAGES))
+    )
+
+
+# Stage index (-1 = not a progress stage) -> rendered bar, built once
+_PROGRESS_BARS: dict[int, str] = {
+    idx: _progress_bar(idx) for idx in range(-1, len(PROGRESS_STAGES))
+}
+
+# ---------------------------------------------------------------------------
+# Order status card templates
+# ---------------------------------------------------------------------------
+_TPL_BASE = (
+    "{emoji} <b>Order</b>  <code>{id}</code>\n"
+    "\n"
+    "{progress}\n"
+    "<b>Status:</b> {status_title}\n"
+    "<b>Send:</b>  {amount_in}\n"
+    "<b>Receive:</b> {amount_out}"
+)
+# Optional lines, in display order; bit i of the mask selects _TPL_OPTIONAL[i]
+_TPL_OPTIONAL = (
+    "\n<b>Deposit to:</b> <code>{deposit_address}</code>",
+    "\n<b>Destination:</b> <code>{destination}</code>",
+    "\n<b>Fee:</b> {fee}",
+    "\n<b>Created:</b> {created_at}",
+)
+# Presence mask -> full template, precomposed for all 16 combinations
+_ORDER_TEMPLATES: tuple[str, ...] = tuple(
+    _TPL_BASE + "".join(line for bit, line in enumerate(_TPL_OPTIONAL) if mask >> bit & 1)
+    for mask in range(1 << len(_TPL_OPTIONAL))
+)
 
 CHAIN_LABELS: dict[str, str] = {
     "XMR": "Monero",
@@ -42,6 +88,11 @@ CHAIN_LABELS: dict[str, str] = {
     "USDT": "USDT",
 }
 
+# Stablecoins are shown with 2 decimals, everything else with 6
+_STABLECOINS = frozenset({"USDC", "USDT"})
+_FMT_STABLE = "{:,.2f} {}".format
+_FMT_DEFAULT = "{:,.6f} {}".format
+
 CHAIN_EMOJI: dict[str, str] = {
     "XMR": "\U0001f6e1\ufe0f",   # shield
     "BTC": "\U0001fa99",          # coin
@@ -55,64 +106,59 @@ CHAIN_EMOJI: dict[str, str] = {
 }
 
 
-def format_order_status(order: dict[str, Any]) -> str:
-    """Return a rich text summary of an order with emoji progress bar."""
-    status = order.get("status", "pending")
-    emoji = STATUS_EMOJI.get(status, "\u2753")
+def _rate_affixes(from_sym: str, to_sym: str) -> tuple[str, str]:
+    """Text before and after the rate number in a format_rate line."""
+    from_emoji = CHAIN_EMOJI.get(from_sym, "")
+    to_emoji = CHAIN_EMOJI.get(to_sym, "")
+    return f"{from_emoji} 1 {from_sym}  \u2248  ", f" {to_sym} {to_emoji}"
 
-    # Build a progress bar
-    try:
-        idx = PROGRESS_STAGES.index(status)
-    except ValueError:
-        idx = -1
-    bar_parts: list[str] = []
-    for i, stage in enumerate(PROGRESS_STAGES):
-        if i < idx:
-            bar_parts.append("\u2705")
-        elif i == idx:
-            bar_parts.append("\U0001f7e2")  # green circle = current
-        else:
-            bar_parts.append("\u26aa")       # white circle
-    progress = " ".join(bar_parts)
-
-    from_sym = order.get("from_currency", "XMR")
-    to_sym = order.get("to_currency", "???")
-    amount_in = format_amount(order.get("amount_in"), from_sym)
-    amount_out = format_amount(order.get("amount_out"), to_sym)
-
-    lines = [
-        f"{emoji} <b>Order</b>  <code>{order.get('id', 'N/A')}</code>",
-        f"",
-        f"{progress}",
-        f"<b>Status:</b> {status.replace('_', ' ').title()}",
-        f"<b>Send:</b>  {amount_in}",
-        f"<b>Receive:</b> {amount_out}",
-    ]
-
-    if order.get("deposit_address"):
-        lines.append(f"<b>Deposit to:</b> <code>{order['deposit_address']}</code>")
-    if order.get("destination_address"):
-        lines.append(
-            f"<b>Destination:</b> <code>{truncate_address(order['destination_address'])}</code>"
-        )
-    if order.get("fee"):
-        lines.append(f"<b>Fee:</b> {order['fee']}")
-    if order.get("created_at"):
-        lines.append(f"<b>Created:</b> {order['created_at']}")
-
-    return "\n".join(lines)
+
+# (from, to) -> rate line affixes for every supported pair, built once
+_RATE_AFFIXES: dict[tuple[str, str], tuple[str, str]] = {
+    (a, b): _rate_affixes(a, b) for a in CHAIN_LABELS for b in CHAIN_LABELS
+}
 
 
+def format_order_status(order: Order) -> str:
+    """Return a rich text summary of an order with emoji progress bar."""
+    status = order.status
+    emoji = STATUS_EMOJI.get(status, "\u2753")
+    progress = _PROGRESS_BARS[_STAGE_INDEX.get(status, -1)]
+
+    deposit = order.deposit_address
+    destination = order.destination_address
+    fee = order.fee
+    created_at = order.created_at
+    mask = (
+        bool(deposit)
+        | bool(destination) << 1
+        | bool(fee) << 2
+        | bool(created_at) << 3
+    )
+    return _ORDER_TEMPLATES[mask].format(
+        emoji=emoji,
+        id=order.id,
+        progress=progress,
+        status_title=_STATUS_LABEL.get(status) or status.replace("_", " ").title(),
+        amount_in=format_amount(order.amount_in, order.from_currency),
+        amount_out=format_amount(order.amount_out, order.to_currency),
+        deposit_address=deposit,
+        destination=truncate_address(destination) if destination else None,
+        fee=fee,
+        created_at=created_at,
+    )
+
+
+@functools.lru_cache(maxsize=1024)
 def format_rate(direction: str, rate: float | str, change_24h: float | str | None = None) -> str:
     """Format a rate line, e.g. '1 XMR ~ 52.35 TON (+2.1%)'."""
     parts = direction.upper().split("_")
     from_sym = parts[0] if len(parts) >= 1 else "XMR"
     to_sym = parts[1] if len(parts) >= 2 else "???"
-    from_emoji = CHAIN_EMOJI.get(from_sym, "")
-    to_emoji = CHAIN_EMOJI.get(to_sym, "")
+    head, tail = _RATE_AFFIXES.get((from_sym, to_sym)) or _rate_affixes(from_sym, to_sym)
 
     rate_str = f"{float(rate):,.6f}" if rate else "N/A"
-    line = f"{from_emoji} 1 {from_sym}  \u2248  {rate_str} {to_sym} {to_emoji}"
+    line = head + rate_str + tail
     if change_24h is not None:
         try:
             ch = float(change_24h)
@@ -123,6 +169,7 @@ def format_rate(direction: str, rate: float | str, change_24h: float | str | Non
     return line
 
 
+@functools.lru_cache(maxsize=1024)
 def format_amount(amount: float | str | None, symbol: str) -> str:
     """Format an amount, e.g. '1.500000 XMR'."""
     if amount is None:
@@ -131,11 +178,11 @@ def format_amount(amount: float | str | None, symbol: str) -> str:
         val = float(amount)
     except (ValueError, TypeError):
         return f"{amount} {symbol}"
-    # Use 6 decimal places for crypto, 2 for stables
-    decimals = 2 if symbol in ("USDC", "USDT") else 6
-    return f"{val:,.{decimals}f} {symbol}"
+    return (_FMT_STABLE if symbol in _STABLECOINS else _FMT_DEFAULT)(val, symbol)
 
 
+# Sized for every address of a few hundred orders rendered repeatedly
+@functools.lru_cache(maxsize=2048)
 def truncate_address(addr: str | None, prefix: int = 6, suffix: int = 4) -> str:
     """Truncate a blockchain address for display: '4Ab3...xyz9'."""
     if not addr:
@@ -0,0 +1,74 @@
+"""Router with O(1) dispatch for exact-match callback data."""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from aiogram import Router
+from aiogram.dispatcher.event.handler import CallbackType, HandlerObject
+from aiogram.dispatcher.event.telegram import TelegramEventObserver
+from aiogram.types import TelegramObject
+
+
+class _ExactCallbackObserver(TelegramEventObserver):
+    """callback_query observer that looks handlers up by ``callback.data`` first.
+
+    Handlers registered through :meth:`exact` live in a dict instead of the
+    linear ``handlers`` list, so the common ``F.data == "menu:..."`` case costs
+    one dict lookup instead of evaluating every filter in turn.
+
+    The dict is reached through one ordinary dispatching handler, registered
+    first, so only public aiogram behaviour is relied on:
+
+    * the observer stays non-empty, so ``resolve_used_update_types`` (and
+      with it ``allowed_updates``) still sees ``callback_query``;
+    * a filter may return a dict that is merged into handler data -- the
+      dispatching filter returns the matched handler's own filter data plus
+      ``handler``, so middlewares and flags see the real handler object;
+    * ``SkipHandler`` from an exact handler falls through to the normal
+      handlers, as it does for any other handler.
+    """
+
+    def __init__(self, router: Router, event_name: str) -> None:
+        super().__init__(router=router, event_name=event_name)
+        self._exact: dict[str, HandlerObject] = {}
+        self.register(self._dispatch_exact, self._match_exact)
+
+    def exact(
+        self, data: str, *filters: CallbackType, flags: dict[str, Any] | None = None,
+    ) -> Callable[[CallbackType], CallbackType]:
+        """Decorator: handle callbacks whose data is exactly *data*."""
+
+        def wrapper(callback: CallbackType) -> CallbackType:
+            self.register(callback, *filters, flags=flags)
+            self._exact[data] = self.handlers.pop()
+            return callback
+
+        return wrapper
+
+    async def _match_exact(
+        self, event: TelegramObject, **kwargs: Any,
+    ) -> bool | dict[str, Any]:
+        handler = self._exact.get(getattr(event, "data", None) or "")
+        if handler is None:
+            return False
+        kwargs["handler"] = handler
+        result, data = await handler.check(event, **kwargs)
+        if not result:
+            return False
+        return {**data, "handler": handler}
+
+    @staticmethod
+    async def _dispatch_exact(event: TelegramObject, handler: HandlerObject, **kwargs: Any) -> Any:
+        return await handler.call(event, handler=handler, **kwargs)
+
+
+class ExactDataRouter(Router):
+    """Router whose ``callback_query`` observer supports ``.exact(data)``."""
+
+    callback_query: _ExactCallbackObserver
+
+    def __init__(self, *, name: str | None = None) -> None:
+        super().__init__(name=name)
+        self.callback_query = _ExactCallbackObserver(router=self, event_name="callback_query")
+        self.observers["callback_query"] = self.callback_query
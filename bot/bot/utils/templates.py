@@ -0,0 +1,28 @@
+"""Jinja2 environment for the message templates in ``bot/templates``.
+
+Templates are compiled once when first loaded (``auto_reload=False``) and
+rendered with plain Telegram HTML -- values are inserted as-is, exactly like
+the f-strings they replace.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, Template
+
+TEMPLATE_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+env = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    auto_reload=False,
+    autoescape=False,
+    trim_blocks=True,
+    lstrip_blocks=True,
+    undefined=StrictUndefined,
+)
+
+
+def load_template(name: str) -> Template:
+    """Return the compiled template *name* from ``bot/templates``."""
+    return env.get_template(name)